@@ -18,6 +18,9 @@ struct AdtSessionOptions {
     std::chrono::seconds read_timeout{120};
     bool disable_tls_verify = false;
     std::chrono::seconds poll_interval{2};
+    // Reuse one TCP/TLS connection across requests (MCP server, multi-call
+    // commands like lineage) instead of reconnecting for every request.
+    bool keep_alive = true;
 };
 
 // ---------------------------------------------------------------------------
@@ -33,6 +36,7 @@ struct AdtSessionOptions {
 //   - Cookie jar: handled by httplib::Client automatically
 //   - Async polling: PollUntilComplete for 202 responses
 //   - TLS: optional disable for self-signed certs
+//   - Keep-alive: one persistent connection per session by default
 // ---------------------------------------------------------------------------
 class AdtSession : public IAdtSession {
 public:
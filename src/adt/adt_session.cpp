@@ -146,6 +146,7 @@ struct AdtSession::Impl {
         client->set_basic_auth(user, password);
         client->set_connection_timeout(opts.connect_timeout);
         client->set_read_timeout(opts.read_timeout);
+        client->set_keep_alive(opts.keep_alive);
 
         if (use_https && opts.disable_tls_verify) {
             client->enable_server_certificate_verification(false);
@@ -947,14 +947,19 @@ int HandleObjectDelete(const CommandArgs& args) {
     OutputFormatter fmt(JsonMode(args), ColorMode(args));
 
     if (args.positional.empty()) {
-        fmt.PrintError(MakeValidationError("Missing object URI. Usage: erpl-adt object delete <uri>"));
+        fmt.PrintError(MakeValidationError("Missing object URI. Usage: erpl-adt object delete <uri> [<uri2> ...]"));
         return 99;
     }
 
-    auto uri_result = ObjectUri::Create(args.positional[0]);
-    if (uri_result.IsErr()) {
-        fmt.PrintError(MakeValidationError("Invalid URI: " + uri_result.Error()));
-        return 99;
+    std::vector<ObjectUri> uris;
+    uris.reserve(args.positional.size());
+    for (const auto& positional : args.positional) {
+        auto uri_result = ObjectUri::Create(positional);
+        if (uri_result.IsErr()) {
+            fmt.PrintError(MakeValidationError("Invalid URI: " + uri_result.Error()));
+            return 99;
+        }
+        uris.push_back(std::move(uri_result).Value());
     }
 
     std::optional<std::string> transport;
@@ -966,6 +971,11 @@ int HandleObjectDelete(const CommandArgs& args) {
 
     std::optional<LockHandle> explicit_handle;
     if (!handle_str.empty()) {
+        if (uris.size() > 1) {
+            fmt.PrintError(MakeValidationError(
+                "--handle applies to a single URI; omit it to delete several objects"));
+            return 99;
+        }
         auto handle_result = LockHandle::Create(handle_str);
         if (handle_result.IsErr()) {
             fmt.PrintError(MakeValidationError("Invalid handle: " + handle_result.Error()));
@@ -979,9 +989,38 @@ int HandleObjectDelete(const CommandArgs& args) {
         return 99;
     }
 
+    if (uris.size() > 1) {
+        // Several URIs: auto-lock each one in turn over the same session and
+        // keep going past failures, so one locked object does not stop a sweep.
+        nlohmann::json deleted = nlohmann::json::array();
+        nlohmann::json failed = nlohmann::json::array();
+        int exit_code = 0;
+        for (size_t i = 0; i < uris.size(); ++i) {
+            auto del_result = DeleteObjectWithAutoLock(*session, uris[i], transport);
+            if (del_result.IsErr()) {
+                const auto& err = del_result.Error();
+                if (exit_code == 0) exit_code = err.ExitCode();
+                failed.push_back({{"uri", args.positional[i]},
+                                  {"error", err.message}});
+                if (!fmt.IsJsonMode()) fmt.PrintError(err);
+                continue;
+            }
+            deleted.push_back(args.positional[i]);
+            if (!fmt.IsJsonMode()) fmt.PrintSuccess("Deleted: " + args.positional[i]);
+        }
+        if (fmt.IsJsonMode()) {
+            nlohmann::json j;
+            j["success"] = failed.empty();
+            j["deleted"] = std::move(deleted);
+            j["failed"] = std::move(failed);
+            fmt.PrintJson(j.dump());
+        }
+        return exit_code;
+    }
+
     if (explicit_handle.has_value()) {
         // Explicit handle: use it directly (advanced / session-file mode).
-        auto result = DeleteObject(*session, uri_result.Value(),
+        auto result = DeleteObject(*session, uris[0],
                                    *explicit_handle, transport);
         if (result.IsErr()) {
             fmt.PrintError(result.Error());
@@ -990,7 +1029,7 @@ int HandleObjectDelete(const CommandArgs& args) {
     } else {
         // Auto-lock mode: lock → delete → unlock in a single session.
         auto del_result = DeleteObjectWithAutoLock(
-            *session, uri_result.Value(), transport);
+            *session, uris[0], transport);
         if (del_result.IsErr()) {
             fmt.PrintError(del_result.Error());
             return del_result.Error().ExitCode();
@@ -1444,14 +1483,21 @@ int HandleSourceWrite(const CommandArgs& args) {
         return 99;
     }
 
-    // Read source from file.
-    std::ifstream ifs(file_path);
-    if (!ifs) {
-        fmt.PrintError(MakeValidationError("Cannot open file: " + file_path));
-        return 99;
+    // Read source from file, or from stdin for "--file -".
+    std::string source;
+    if (file_path == "-") {
+        std::ostringstream ss;
+        ss << std::cin.rdbuf();
+        source = ss.str();
+    } else {
+        std::ifstream ifs(file_path);
+        if (!ifs) {
+            fmt.PrintError(MakeValidationError("Cannot open file: " + file_path));
+            return 99;
+        }
+        source.assign(std::istreambuf_iterator<char>(ifs),
+                      std::istreambuf_iterator<char>());
     }
-    std::string source((std::istreambuf_iterator<char>(ifs)),
-                       std::istreambuf_iterator<char>());
 
     std::optional<std::string> transport;
     if (HasFlag(args, "transport")) {
@@ -4593,14 +4639,10 @@ static int RenderBwExport(const CommandArgs& args,
     BwMermaidOptions mopts;
     mopts.iobj_edges = HasFlag(args, "iobj-edges");
 
-    std::string catalog_json = BwRenderExportCatalogJson(exp);
-    std::string mermaid_str = mermaid_mode ? BwRenderExportMermaid(exp, mopts) : "";
-    std::string om_json;
-    if (shape == "openmetadata") {
-        om_json = BwRenderExportOpenMetadataJson(exp, service_name, system_id);
-    }
-
+    // Each rendering is built only on the path that emits it: large
+    // exports serialize to megabytes, and most invocations need just one.
     if (HasFlag(args, "out-dir")) {
+        const std::string catalog_json = BwRenderExportCatalogJson(exp);
         auto out_dir = GetFlag(args, "out-dir");
         std::string catalog_path = out_dir + "/" + object_name + "_catalog.json";
         std::string mmd_path = out_dir + "/" + object_name + "_dataflow.mmd";
@@ -4646,6 +4688,7 @@ static int RenderBwExport(const CommandArgs& args,
             std::cout << mmd;
         }
     } else if (shape == "openmetadata") {
+        const auto om_json = BwRenderExportOpenMetadataJson(exp, service_name, system_id);
         if (editor_mode) {
             auto tmp = MakeTempPath(".json");
             std::ofstream tf(tmp);
@@ -4658,6 +4701,7 @@ static int RenderBwExport(const CommandArgs& args,
         }
     } else {
         if (fmt.IsJsonMode()) {
+            const std::string catalog_json = BwRenderExportCatalogJson(exp);
             if (editor_mode) {
                 auto tmp = MakeTempPath(".json");
                 std::ofstream tf(tmp);
@@ -6410,15 +6454,21 @@ void RegisterAllCommands(CommandRouter& router) {
     // -----------------------------------------------------------------------
     {
         CommandHelp help;
-        help.usage = "erpl-adt object delete <uri> [flags]";
-        help.args_description = "<uri>    Object URI to delete";
-        help.long_description = "Without --handle, auto-locks, deletes, and unlocks in one session.";
+        help.usage = "erpl-adt object delete <uri> [<uri2> ...] [flags]";
+        help.args_description = "<uri>    Object URI(s) to delete";
+        help.long_description = "Without --handle, auto-locks, deletes, and unlocks in one session. "
+                                "Several URIs are deleted in turn over that session; failures are "
+                                "reported per URI and do not stop the remaining deletions. "
+                                "With --json, those per-URI failures appear only in the "
+                                "{success, deleted, failed} summary on stdout, not on stderr; "
+                                "the exit code is that of the first failure.";
         help.flags = {
-            {"handle", "<handle>", "Lock handle (skips auto-lock if provided)", false},
+            {"handle", "<handle>", "Lock handle (single URI only; skips auto-lock)", false},
             {"transport", "<id>", "Transport request number", false},
         };
         help.examples = {
             "erpl-adt object delete /sap/bc/adt/oo/classes/ZCL_OLD",
+            "erpl-adt object delete /sap/bc/adt/oo/classes/ZCL_OLD /sap/bc/adt/oo/classes/ZCL_OLDER",
             "erpl-adt object delete /sap/bc/adt/oo/classes/ZCL_OLD --transport=NPLK900001",
         };
         router.Register("object", "delete", "Delete an ABAP object",
@@ -6547,7 +6597,7 @@ void RegisterAllCommands(CommandRouter& router) {
         help.long_description = "Without --handle, the object is automatically locked, written, and unlocked. "
             "Use --activate to activate the object after writing.";
         help.flags = {
-            {"file", "<path>", "Path to local source file", true},
+            {"file", "<path>", "Path to local source file, or - to read stdin", true},
             {"handle", "<handle>", "Lock handle (skips auto-lock if provided)", false},
             {"transport", "<id>", "Transport request number", false},
             {"session-file", "<path>", "Session file for stateful workflow", false},
@@ -6556,6 +6606,7 @@ void RegisterAllCommands(CommandRouter& router) {
         help.examples = {
             "erpl-adt source write /sap/bc/adt/oo/classes/zcl_test/source/main --file=source.abap",
             "erpl-adt source write /sap/bc/adt/oo/classes/zcl_test/source/main --file=source.abap --activate",
+            "erpl-adt source write /sap/bc/adt/oo/classes/zcl_test/source/main --file=- < source.abap",
             "erpl-adt source write /sap/bc/adt/oo/classes/zcl_test/source/main --file=source.abap --handle=LOCK_HANDLE --transport=NPLK900001",
         };
         router.Register("source", "write", "Write source code",
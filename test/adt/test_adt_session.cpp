@@ -722,6 +722,31 @@ TEST_CASE("AdtSession: Basic Auth is sent on every request", "[adt][session][liv
     CHECK(auth_headers[0].find("Basic") != std::string::npos);
 }
 
+TEST_CASE("AdtSession: requests reuse one keep-alive connection", "[adt][session][live]") {
+    httplib::Server svr;
+
+    std::vector<int> remote_ports;
+
+    svr.Get("/sap/bc/adt/ping", [&](const httplib::Request& req,
+                                     httplib::Response& res) {
+        remote_ports.push_back(req.remote_port);
+        res.set_content("<ok/>", "text/xml");
+    });
+
+    LocalServer server(svr);
+    auto session = MakeTestSession(server.Port());
+
+    for (int i = 0; i < 3; ++i) {
+        auto result = session->Get("/sap/bc/adt/ping");
+        REQUIRE(result.IsOk());
+    }
+
+    // Same client-side port means the same TCP connection was reused.
+    REQUIRE(remote_ports.size() == 3);
+    CHECK(remote_ports[0] == remote_ports[1]);
+    CHECK(remote_ports[1] == remote_ports[2]);
+}
+
 TEST_CASE("AdtSession: POST sends body and content-type", "[adt][session][live]") {
     httplib::Server svr;
 
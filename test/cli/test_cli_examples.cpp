@@ -240,6 +240,17 @@ TEST_CASE("CLI example: source write", "[cli][examples]") {
     CHECK(result.Value().flags.at("transport") == "NPLK900001");
 }
 
+TEST_CASE("CLI example: source write from stdin", "[cli][examples]") {
+    const char* argv[] = {"erpl-adt", "source", "write",
+                          "/sap/bc/adt/oo/classes/zcl_test/source/main",
+                          "--file", "-"};
+    auto result = CommandRouter::Parse(6, argv);
+    REQUIRE(result.IsOk());
+    CHECK(result.Value().action == "write");
+    REQUIRE(result.Value().positional.size() == 1);
+    CHECK(result.Value().flags.at("file") == "-");
+}
+
 TEST_CASE("CLI example: source edit by name", "[cli][examples]") {
     const char* argv[] = {"erpl-adt", "source", "edit", "ZCL_MY_CLASS",
                           "--type=CLAS", "--activate"};
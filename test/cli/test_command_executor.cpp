@@ -170,6 +170,26 @@ TEST_CASE("object delete: invalid URI returns 99",
     CHECK(router.Dispatch(4, argv) == 99);
 }
 
+TEST_CASE("object delete: invalid URI among several returns 99",
+          "[cli][executor]") {
+    CommandRouter router;
+    RegisterAllCommands(router);
+    const char* argv[] = {"erpl-adt", "object", "delete",
+                          "/sap/bc/adt/oo/classes/zcl_a", "not-a-uri"};
+    CHECK(router.Dispatch(5, argv) == 99);
+}
+
+TEST_CASE("object delete: --handle with several URIs returns 99",
+          "[cli][executor]") {
+    CommandRouter router;
+    RegisterAllCommands(router);
+    const char* argv[] = {"erpl-adt", "object", "delete",
+                          "/sap/bc/adt/oo/classes/zcl_a",
+                          "/sap/bc/adt/oo/classes/zcl_b",
+                          "--handle", "abc123"};
+    CHECK(router.Dispatch(7, argv) == 99);
+}
+
 TEST_CASE("transport create: missing --desc returns 99",
           "[cli][executor]") {
     CommandRouter router;
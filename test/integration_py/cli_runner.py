@@ -1,8 +1,20 @@
-"""Subprocess wrapper for erpl-adt CLI binary."""
-import json
+"""Subprocess wrapper for erpl-adt CLI binary.
+
+erpl-adt is a native executable with no Python entry point, so every
+command is a separate process; run_many() is the way to overlap them.
+McpSession keeps one `erpl-adt mcp` process (and its SAP logon) alive
+for read-only lookups that don't need to exercise the CLI itself.
+"""
+import functools
+import re
 import shlex
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 
 
 def _mask_password(cmd):
@@ -16,38 +28,197 @@ def _mask_password(cmd):
     return masked
 
 
+_NOT_ACTIVATED_RE = re.compile(rb"not activated|not implemented",
+                               re.IGNORECASE)
+# One alternation scans stderr once for every "endpoint missing" phrase.
+_UNAVAILABLE_RE = re.compile(
+    rb'not activated|not implemented|not found|"http_status":40[45]',
+    re.IGNORECASE)
+# Looser variant for the BW e2e workflows, which have always skipped on any
+# 404 in stderr: a missing service there may surface in the human-readable
+# message text ("HTTP 404") rather than as a JSON "http_status" field.
+_MISSING_RE = re.compile(rb"not activated|not implemented|not found|404",
+                         re.IGNORECASE)
+
+
+class CliResult(subprocess.CompletedProcess):
+    """CompletedProcess that keeps stdout and stderr as bytes.
+
+    JSON is parsed straight from ``stdout_bytes`` and error text matched
+    against ``stderr_bytes``; ``stdout``/``stderr`` are decoded on first
+    access for tests that work with text. Undecodable bytes become U+FFFD
+    so a stray non-UTF-8 byte fails the assertion, not the decode.
+    """
+
+    def __init__(self, completed):
+        self.args = completed.args
+        self.returncode = completed.returncode
+        self.stdout_bytes = completed.stdout
+        self.stderr_bytes = completed.stderr
+
+    @functools.cached_property
+    def stdout(self):
+        return self.stdout_bytes.decode(errors="replace")
+
+    @functools.cached_property
+    def stderr(self):
+        return self.stderr_bytes.decode(errors="replace")
+
+
+def parse_stdout(result, default=None):
+    """Parse a result's stdout as JSON; ``default`` if it printed nothing."""
+    buf = result.stdout_bytes
+    if not buf or buf.isspace():
+        return default
+    return orjson.loads(buf)
+
+
+def not_activated(result):
+    """True if a failed BW command reports an inactive or missing service."""
+    return _NOT_ACTIVATED_RE.search(result.stderr_bytes) is not None
+
+
+def endpoint_unavailable(result):
+    """True if a failed command reports an inactive or missing endpoint."""
+    return _UNAVAILABLE_RE.search(result.stderr_bytes) is not None
+
+
+def endpoint_missing(result):
+    """Like ``endpoint_unavailable``, but any 404 in stderr also counts."""
+    return _MISSING_RE.search(result.stderr_bytes) is not None
+
+
+def _execute(cmd, timeout, env=None, input=None):
+    """Log and run one CLI command, capturing its output.
+
+    All runner methods go through here. Output is collected with
+    communicate() over default-buffered pipes; nothing reads line by line.
+    Keep this free of preexec_fn and of user, group or extra_groups
+    changes: CPython only spawns with vfork when none of those are set,
+    instead of a full fork of the pytest process. Leaving env as None
+    merely spares copying the environment for each command. Arguments go
+    over as a list without shell=True, so names and passwords need no
+    quoting.
+    """
+    # Log command for documentation / debugging
+    masked = _mask_password(cmd)
+    print(f"\n$ {' '.join(shlex.quote(a) for a in masked)}",
+          file=sys.stderr)
+    result = CliResult(subprocess.run(
+        cmd, capture_output=True, timeout=timeout, env=env, input=input,
+    ))
+    if result.returncode != 0:
+        print(f"  -> exit {result.returncode}", file=sys.stderr)
+    return result
+
+
+class McpSession:
+    """Long-lived ``erpl-adt mcp`` process driven over JSON-RPC on stdio.
+
+    The server reads one JSON message per line and answers each request
+    with one line, so calls are serialized under a lock. Its stderr goes to
+    a temporary file rather than a pipe nobody drains, and the tail of it
+    is reported if the server dies.
+    """
+
+    def __init__(self, cmd):
+        masked = _mask_password(cmd)
+        print(f"\n$ {' '.join(shlex.quote(a) for a in masked)}",
+              file=sys.stderr)
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=self._stderr,
+        )
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._request("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {"name": "erpl-adt-integration-tests",
+                           "version": "0.1.0"},
+        })
+        self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    def _send(self, message):
+        self._proc.stdin.write(orjson.dumps(message) + b"\n")
+        self._proc.stdin.flush()
+
+    def _request(self, method, params):
+        with self._lock:
+            self._next_id += 1
+            self._send({"jsonrpc": "2.0", "id": self._next_id,
+                        "method": method, "params": params})
+            line = self._proc.stdout.readline()
+        if not line:
+            try:
+                code = self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                code = None
+            self._stderr.seek(0)
+            tail = self._stderr.read()[-2000:].decode(errors="replace")
+            raise RuntimeError(
+                f"erpl-adt mcp exited (code {code}): {tail.strip()}")
+        reply = orjson.loads(line)
+        if "error" in reply:
+            raise RuntimeError(f"{method}: {reply['error']['message']}")
+        return reply["result"]
+
+    def call(self, tool, **arguments):
+        """Call an MCP tool; return ``(ok, payload)``.
+
+        ``payload`` is the tool's text content, parsed as JSON when it is.
+        """
+        result = self._request(
+            "tools/call", {"name": tool, "arguments": arguments})
+        text = result["content"][0]["text"] if result["content"] else ""
+        try:
+            payload = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            payload = text
+        return not result.get("isError", False), payload
+
+    def close(self):
+        """Close stdin so the server exits, then reap it."""
+        self._proc.stdin.close()
+        try:
+            self._proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        self._proc.stdout.close()
+        self._stderr.close()
+
+
 class CliRunner:
     """Invoke the erpl-adt binary and parse JSON output."""
 
     def __init__(self, binary_path, host, port, user, password, client):
         self.binary = str(binary_path)
-        self.base_args = [
+        # Connection flags alone, for commands that print human-readable output.
+        self.connection_args = [
             "--host", host,
             "--port", str(port),
             "--user", user,
             "--password", password,
             "--client", client,
-            "--json=true",
         ]
+        self.base_args = self.connection_args + ["--json=true"]
 
-    def run(self, *args, session_file=None, timeout=120, extra_flags=None):
-        """Run a CLI command and return CompletedProcess."""
+    def run(self, *args, session_file=None, timeout=120, extra_flags=None,
+            input=None):
+        """Run a CLI command and return CompletedProcess.
+
+        ``input`` (bytes) is fed to the command's stdin, e.g. for
+        ``source write --file -``.
+        """
         cmd = [self.binary] + self.base_args
         if session_file:
             cmd += ["--session-file", str(session_file)]
         if extra_flags:
             cmd += [str(f) for f in extra_flags]
         cmd += [str(a) for a in args]
-        # Log command for documentation / debugging
-        masked = _mask_password(cmd)
-        print(f"\n$ {' '.join(shlex.quote(a) for a in masked)}",
-              file=sys.stderr)
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout,
-        )
-        if result.returncode != 0:
-            print(f"  -> exit {result.returncode}", file=sys.stderr)
-        return result
+        return _execute(cmd, timeout, input=input)
 
     def run_raw(self, *args, timeout=120, env=None):
         """Run the binary without --json=true and without base connection args.
@@ -55,36 +226,29 @@ class CliRunner:
         Useful for testing --version, --help, and --password-env.
         """
         cmd = [self.binary] + list(str(a) for a in args)
-        masked = _mask_password(cmd)
-        print(f"\n$ {' '.join(shlex.quote(a) for a in masked)}",
-              file=sys.stderr)
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout, env=env,
-        )
-        if result.returncode != 0:
-            print(f"  -> exit {result.returncode}", file=sys.stderr)
-        return result
+        return _execute(cmd, timeout, env=env)
 
     def run_no_json(self, *args, session_file=None, timeout=120):
         """Run a CLI command without --json=true (human-readable output)."""
-        cmd = [self.binary]
-        # Add base args but skip --json=true
-        for a in self.base_args:
-            if a == "--json=true":
-                continue
-            cmd.append(a)
+        cmd = [self.binary] + self.connection_args
         if session_file:
             cmd += ["--session-file", str(session_file)]
         cmd += [str(a) for a in args]
-        masked = _mask_password(cmd)
-        print(f"\n$ {' '.join(shlex.quote(a) for a in masked)}",
-              file=sys.stderr)
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=timeout,
-        )
-        if result.returncode != 0:
-            print(f"  -> exit {result.returncode}", file=sys.stderr)
-        return result
+        return _execute(cmd, timeout)
+
+    def mcp_session(self):
+        """Start an ``erpl-adt mcp`` server on this runner's connection."""
+        return McpSession([self.binary] + self.base_args + ["mcp"])
+
+    def run_many(self, commands, runner=None, max_workers=8):
+        """Run independent CLI commands concurrently.
+
+        Each entry of ``commands`` is an argument tuple for ``runner``
+        (default: ``run``). Results are returned in input order.
+        """
+        runner = runner or self.run
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda args: runner(*args), commands))
 
     def run_ok(self, *args, **kwargs):
         """Run a CLI command, assert exit code 0, return parsed JSON."""
@@ -94,10 +258,7 @@ class CliRunner:
             f"  cmd: {' '.join(shlex.quote(a) for a in _mask_password(result.args))}\n"
             f"  stderr: {result.stderr}"
         )
-        stdout = result.stdout.strip()
-        if not stdout:
-            return {}
-        return json.loads(stdout)
+        return parse_stdout(result, {})
 
     def run_fail(self, *args, **kwargs):
         """Run a CLI command, assert exit code != 0, return CompletedProcess."""
@@ -2,12 +2,16 @@
 
 import os
 import random
+import shutil
 import socket
+import subprocess
 import time
 
+import orjson
 import pytest
+from filelock import FileLock
 
-from cli_runner import CliRunner
+from cli_runner import CliRunner, not_activated, parse_stdout
 
 
 # ---------------------------------------------------------------------------
@@ -141,59 +145,327 @@ def e2e_context(cli, tmp_path_factory):
         cli.run("object", "delete", uri)
 
 
+@pytest.fixture(scope="session")
+def mmdc_cmd():
+    """Path to the Mermaid CLI, resolved and warmed up once per session.
+
+    A throwaway ``--version`` run pulls Node and the mmdc package into the
+    page cache so the first real render is not charged for the cold load.
+    """
+    path = shutil.which("mmdc")
+    if path is None:
+        pytest.skip("mmdc not installed")
+    subprocess.run([path, "--version"], capture_output=True, timeout=60)
+    return path
+
+
 # ---------------------------------------------------------------------------
 # Session-scoped BW availability fixtures (shared across bw test files)
 # ---------------------------------------------------------------------------
 
-import json as _json  # noqa: E402 — local alias to avoid polluting namespace
-
-
 @pytest.fixture(scope="session")
 def bw_available(cli):
     """Probe BW discovery endpoint once. Skip all BW tests if unavailable."""
     result = cli.run("bw", "discover")
     if result.returncode != 0:
         pytest.skip("BW Modeling API not available on this system")
-    data = _json.loads(result.stdout.strip()) if result.stdout.strip() else []
+    data = parse_stdout(result, [])
     if not data:
         pytest.skip("BW discovery returned no services")
     return data
 
 
+@pytest.fixture(autouse=True)
+def _bw_gate(request):
+    """Skip every ``bw``-marked test up front when BW is not available.
+
+    ``bw_available`` is session-scoped and pytest caches its skip, so an
+    unavailable landscape costs one ``bw discover`` for the whole run; no
+    later BW test, fixture or search gets to start the CLI. Tests marked
+    ``no_backend`` only check argument validation and run regardless.
+    """
+    node = request.node
+    if (node.get_closest_marker("bw") is not None
+            and node.get_closest_marker("no_backend") is None):
+        request.getfixturevalue("bw_available")
+
+
 @pytest.fixture(scope="session")
-def bw_has_search(cli, bw_available):
+def bw_terms(bw_available):
+    """Discovery service terms, computed once per session."""
+    return frozenset(s.get("term", "") for s in bw_available)
+
+
+@pytest.fixture(scope="session")
+def bw_has_search(cli, bw_terms):
     """Check if BW search service is available and activated."""
-    terms = {s.get("term", "") for s in bw_available}
-    if "bwSearch" not in terms and "search" not in terms:
+    if "bwSearch" not in bw_terms and "search" not in bw_terms:
         pytest.skip("BW search service not available")
     # Probe the search endpoint — discovery may list it even if not activated
     result = cli.run("bw", "search", "*", "--max", "1")
     if result.returncode != 0:
-        stderr = result.stderr.strip().lower()
-        if "not activated" in stderr or "not implemented" in stderr:
+        if not_activated(result):
             pytest.skip("BW search service listed but not activated")
         pytest.fail(f"BW search probe failed unexpectedly: {result.stderr.strip()}")
     return True
 
 
 @pytest.fixture(scope="session")
-def bw_has_adso(bw_available):
+def bw_has_adso(bw_terms):
     """Check if ADSO service is available."""
-    terms = {s.get("term", "") for s in bw_available}
-    if "adso" not in terms:
+    if "adso" not in bw_terms:
         pytest.skip("BW ADSO service not available")
     return True
 
 
 @pytest.fixture(scope="session")
-def bw_has_cto(bw_available):
+def bw_has_cto(bw_terms):
     """Check if BW transport organizer (CTO) service is available."""
-    terms = {s.get("term", "") for s in bw_available}
-    if "cto" not in terms:
+    if "cto" not in bw_terms:
         pytest.skip("BW CTO (transport) service not available")
     return True
 
 
 @pytest.fixture(scope="session")
-def bw_terms(bw_available):
-    return {s.get("term", "") for s in bw_available}
+def mcp(cli, bw_available):
+    """One ``erpl-adt mcp`` server for fixture lookups, shared by the session.
+
+    Fixtures that only need data (not CLI behaviour) call tools here instead
+    of spawning the binary and logging on again for every lookup. All of
+    them are BW lookups, so the server is only started once BW is known to
+    be there.
+    """
+    session = cli.mcp_session()
+    yield session
+    session.close()
+
+
+class _BwSearchCache(dict):
+    """``bw_search`` results over MCP, fetched once per TLOGO.
+
+    ``cache[tlogo]`` is the result list, or None if the search failed;
+    ``cache[None]`` searches across all types.
+    """
+
+    def __init__(self, mcp, max_results=1):
+        super().__init__()
+        self._mcp = mcp
+        self._max_results = max_results
+
+    def __missing__(self, tlogo):
+        args = {"query": "*", "max_results": self._max_results}
+        if tlogo:
+            args["object_type"] = tlogo
+        ok, objs = self._mcp.call("bw_search", **args)
+        self[tlogo] = objs if ok else None
+        return self[tlogo]
+
+
+@pytest.fixture(scope="session")
+def bw_search_cache(mcp, bw_has_search):
+    """Session-wide cache of one-row BW searches, shared by all BW tests.
+
+    ``bw_has_search`` probes the CLI, which resolves the search endpoint
+    from discovery; the MCP tool uses a fixed path. The two can disagree,
+    so the cache probes its own search and skips if that fails.
+    """
+    cache = _BwSearchCache(mcp)
+    if cache[None] is None:
+        pytest.skip("BW search over MCP not available on this system")
+    return cache
+
+
+@pytest.fixture(scope="session")
+def bw_candidates(mcp, bw_search_cache):
+    """Up to ten search hits per TLOGO for fixtures that probe readability."""
+    return _BwSearchCache(mcp, max_results=10)
+
+
+@pytest.fixture(scope="session")
+def known_adso(bw_search_cache):
+    """First ADSO returned by search, shared by every BW test class."""
+    data = bw_search_cache["ADSO"]
+    assert data is not None, "bw search --type ADSO failed"
+    if not data:
+        pytest.skip("No ADSO objects found")
+    return data[0]
+
+
+def _probe_bw_service(cli, bw_search_cache, verb):
+    """Run ``bw <verb>`` on any searchable object; skip if not activated."""
+    objs = bw_search_cache[None]
+    assert objs is not None, "bw search probe failed"
+    if not objs:
+        pytest.skip(f"No BW objects found to probe {verb}")
+    result = cli.run("bw", verb, objs[0]["type"], objs[0]["name"])
+    if result.returncode != 0 and not_activated(result):
+        pytest.skip(f"BW {verb} service not activated")
+    return True
+
+
+@pytest.fixture(scope="session")
+def bw_has_xref(cli, bw_search_cache):
+    """Check if BW xref endpoint is accessible using a real object."""
+    return _probe_bw_service(cli, bw_search_cache, "xref")
+
+
+@pytest.fixture(scope="session")
+def bw_has_nodes(cli, bw_search_cache):
+    """Check if BW nodes endpoint is accessible using a real object."""
+    return _probe_bw_service(cli, bw_search_cache, "nodes")
+
+
+def _first_readable(mcp, candidates, tool, **arguments):
+    """Name of the first search hit that MCP ``tool`` can read.
+
+    The search index may be stale, so hits are probed in order and the
+    loop stops at the first success. Probing over the shared MCP session
+    avoids a CLI spawn and logon per candidate; the tests themselves still
+    go through the CLI. The server answers one request at a time, so
+    probing candidates from threads would not overlap anything and would
+    make the chosen object depend on timing. Returns None if none are
+    readable.
+    """
+    return next((r["name"] for r in candidates
+                 if mcp.call(tool, name=r["name"], **arguments)[0]), None)
+
+
+@pytest.fixture(scope="session")
+def worker_shared(tmp_path_factory, worker_id):
+    """Compute a JSON-serialisable value once per run, even under xdist.
+
+    ``worker_shared(key, produce)`` calls ``produce`` in the first worker to
+    get there and hands the stored result to the others, so discovery
+    probes are not repeated on every worker. Skips are not stored; each
+    worker re-raises its own. Fixtures that use it resolve ``mcp`` and
+    ``bw_candidates`` inside ``produce`` so that only the producing worker
+    starts an MCP server and logs on.
+    """
+    if worker_id == "master":
+        return lambda key, produce: produce()
+    root = tmp_path_factory.getbasetemp().parent
+
+    def shared(key, produce):
+        path = root / f"{key}.json"
+        with FileLock(str(path) + ".lock"):
+            if path.is_file():
+                return orjson.loads(path.read_bytes())
+            value = produce()
+            path.write_bytes(orjson.dumps(value))
+            return value
+
+    return shared
+
+
+def _known_readable(request, tlogo, tool, search_optional=False, **arguments):
+    """Name of a readable ``tlogo`` object from search; skip if there is none.
+
+    With ``search_optional`` a failed search skips instead of failing, for
+    types some landscapes cannot search at all.
+    """
+    mcp = request.getfixturevalue("mcp")
+    data = request.getfixturevalue("bw_candidates")[tlogo]
+    if data is None and search_optional:
+        pytest.skip(f"{tlogo} search not supported on this system")
+    assert data is not None, f"bw search --type {tlogo} failed"
+    if not data:
+        pytest.skip(f"No {tlogo} found")
+    name = _first_readable(mcp, data, tool, **arguments)
+    if name is None:
+        pytest.skip(f"No readable {tlogo} found (search results return 404)")
+    return name
+
+
+@pytest.fixture(scope="session")
+def known_trfn(request, worker_shared):
+    """Find a known transformation that is actually readable."""
+    return worker_shared("known_trfn", lambda: _known_readable(
+        request, "TRFN", "bw_read_transformation"))
+
+
+@pytest.fixture(scope="session")
+def known_dtp(request, worker_shared):
+    """Find a known DTP that is actually readable."""
+    return worker_shared("known_dtp", lambda: _known_readable(
+        request, "DTPA", "bw_read_dtp"))
+
+
+def _rsds_key(hit):
+    """``[name, logsys]`` parsed from an RSDS search URI, or None."""
+    parts = [p for p in hit.get("uri", "").split("/") if p]
+    if "rsds" not in parts:
+        return None
+    idx = parts.index("rsds")
+    if idx + 3 >= len(parts):
+        return None
+    return [parts[idx + 1], parts[idx + 2]]
+
+
+def _readable_rsds(request):
+    """``[name, logsys]`` of a readable RSDS, parsed from its search URI."""
+    mcp = request.getfixturevalue("mcp")
+    data = request.getfixturevalue("bw_candidates")["RSDS"]
+    assert data is not None, "bw search --type RSDS failed"
+    if not data:
+        pytest.skip("No RSDS found")
+    keys = filter(None, map(_rsds_key, data))
+    hit = next((k for k in keys
+                if mcp.call("bw_read_rsds", name=k[0], source_system=k[1])[0]),
+               None)
+    if hit is None:
+        pytest.skip("No readable RSDS found")
+    return hit
+
+
+@pytest.fixture(scope="session")
+def known_rsds(request, worker_shared):
+    """Find a known RSDS with source-system info from URI."""
+    name, logsys = worker_shared(
+        "known_rsds", lambda: _readable_rsds(request))
+    return (name, logsys)
+
+
+@pytest.fixture(scope="session")
+def known_query(request, worker_shared):
+    """Find a readable BW query component."""
+    return worker_shared("known_query", lambda: _known_readable(
+        request, "QUERY", "bw_read_query_component",
+        search_optional=True, component_type="query"))
+
+
+@pytest.fixture(scope="session")
+def known_dmod(request, worker_shared):
+    """Find a readable BW dataflow (DMOD)."""
+    return worker_shared("known_dmod", lambda: _known_readable(
+        request, "DMOD", "bw_read_dataflow"))
+
+
+def _preferred_infoarea(request):
+    """Name of the demo InfoArea if search lists it, else the first hit."""
+    data = request.getfixturevalue("bw_candidates")["AREA"]
+    assert data is not None, "bw search --type AREA failed"
+    if not data:
+        pytest.skip("No AREA objects found on this system")
+    return next((item["name"] for item in data
+                 if "0D_NW_DEMO" in item.get("name", "")), data[0]["name"])
+
+
+@pytest.fixture(scope="session")
+def known_infoarea(request, worker_shared):
+    """Find a known InfoArea to export."""
+    return worker_shared("known_infoarea",
+                         lambda: _preferred_infoarea(request))
+
+
+@pytest.fixture(scope="session")
+def bw_jobs_available(cli, bw_available):
+    """``bw job list`` fetched once per session; skip if the service is off.
+
+    Doubles as the availability probe and as the job list itself.
+    """
+    result = cli.run("bw", "job", "list")
+    if result.returncode != 0:
+        if not_activated(result):
+            pytest.skip("BW jobs service not activated")
+        pytest.skip("BW jobs service unavailable on this system")
+    return parse_stdout(result, [])
@@ -1,10 +1,10 @@
 """Health check tests — verify basic connectivity and CLI operation."""
 
-import json
 import os
 import socket
 import subprocess
 
+import orjson
 import pytest
 
 
@@ -74,7 +74,7 @@ class TestHealth:
             env=env,
         )
         assert result.returncode == 0
-        data = json.loads(result.stdout)
+        data = orjson.loads(result.stdout_bytes)
         assert "workspaces" in data
 
     def test_verbose_flag(self, cli, sap_config):
@@ -126,7 +126,7 @@ class TestLoginLogout:
         assert result.returncode == 0
         creds_file = tmp_path / ".adt.creds"
         assert creds_file.exists()
-        data = json.loads(creds_file.read_text())
+        data = orjson.loads(creds_file.read_bytes())
         assert data["host"] == sap_config["host"]
         assert data["port"] == sap_config["port"]
         assert data["user"] == sap_config["user"]
@@ -171,7 +171,7 @@ class TestLoginLogout:
             cwd=str(tmp_path), env=env,
         )
         assert result.returncode == 0, f"stderr: {result.stderr}"
-        data = json.loads(result.stdout)
+        data = orjson.loads(result.stdout)
         assert "workspaces" in data
 
     def test_logout_deletes_creds(self, cli, tmp_path):
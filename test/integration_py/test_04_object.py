@@ -2,6 +2,8 @@
 
 import pytest
 
+from cli_runner import parse_stdout
+
 
 @pytest.mark.object
 class TestObject:
@@ -56,3 +58,30 @@ class TestObject:
             cli.run("object", "delete", uri)
         except Exception:
             pass
+
+    def test_delete_several_reports_each_uri(self, cli, test_class_name):
+        """Deleting several URIs carries on past a failure and reports each one."""
+        uris = []
+        for suffix in ("A", "B"):
+            data = cli.run_ok(
+                "object", "create",
+                "--type", "CLAS/OC",
+                "--name", test_class_name + suffix,
+                "--package", "$TMP",
+                "--description", "Pytest multi-delete test",
+            )
+            uris.append(data["uri"])
+        missing = "/sap/bc/adt/oo/classes/znonexistent_class_99999"
+
+        try:
+            result = cli.run("object", "delete", *uris, missing)
+            assert result.returncode != 0
+            data = parse_stdout(result)
+            assert data["success"] is False
+            assert data["deleted"] == uris
+            assert [f["uri"] for f in data["failed"]] == [missing]
+            assert data["failed"][0]["error"]
+        finally:
+            # Anything the call under test left behind.
+            for uri in uris:
+                cli.run("object", "delete", uri)
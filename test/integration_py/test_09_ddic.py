@@ -1,5 +1,6 @@
 """DDIC (Data Dictionary) tests — validate package and table operations via CLI."""
 
+import orjson
 import pytest
 
 
@@ -35,8 +36,7 @@ class TestDdic:
         result = cli.run("ddic", "table", "sflight")
         if result.returncode != 0:
             pytest.skip("SFLIGHT table not found on this system")
-        import json
-        data = json.loads(result.stdout)
+        data = orjson.loads(result.stdout_bytes)
         assert "name" in data
         assert "fields" in data
 
@@ -45,8 +45,7 @@ class TestDdic:
         result = cli.run("ddic", "table", "sflight")
         if result.returncode != 0:
             pytest.skip("SFLIGHT table not found on this system")
-        import json
-        data = json.loads(result.stdout)
+        data = orjson.loads(result.stdout_bytes)
         assert data["name"].upper() == "SFLIGHT"
         assert len(data.get("description", "")) > 0, "Expected non-empty description"
 
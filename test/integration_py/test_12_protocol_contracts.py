@@ -1,11 +1,17 @@
-"""Protocol-contract integration tests using a local ADT stub server."""
+"""Protocol-contract integration tests using a local ADT stub server.
+
+These deliberately run the real erpl-adt binary as a subprocess: the
+contract under test is the CLI boundary itself (exit codes and the JSON
+error document on stderr), which an in-process binding would bypass.
+"""
 
-import json
 import os
 import socketserver
 import threading
-import time
-from http.server import BaseHTTPRequestHandler
+from http import HTTPStatus
+
+import orjson
+import pytest
 
 from cli_runner import CliRunner
 
@@ -17,47 +23,163 @@ def _binary_path():
     )
 
 
+# Shared response for unmatched paths; bodies may be str or bytes.
+_NOT_FOUND = (404, {}, b"not found")
+
+
+_MAX_LINE = 65537
+
+
+class _Headers(dict):
+    """Request headers keyed by lower-cased name; lookups are case-insensitive."""
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+class _RouteTable:
+    """``(method, path prefix)`` routes resolved by longest matching prefix.
+
+    Lookup probes one dict key per distinct prefix length instead of
+    testing every prefix with ``startswith``.
+    """
+
+    def __init__(self, routes=None):
+        self._routes = {}
+        self._lengths = []
+        for (method, prefix), callback in (routes or {}).items():
+            self.add(method, prefix, callback)
+
+    def add(self, method, prefix, callback):
+        self._routes[(method, prefix)] = callback
+        self._lengths = sorted({len(p) for _, p in self._routes}, reverse=True)
+
+    def clear(self):
+        self._routes.clear()
+        self._lengths = []
+
+    def match(self, method, path):
+        for length in self._lengths:
+            if length <= len(path):
+                callback = self._routes.get((method, path[:length]))
+                if callback is not None:
+                    return callback
+        return None
+
+
 class _ThreadingTcpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
     allow_reuse_address = True
     daemon_threads = True
 
 
 class StubAdtServer:
-    def __init__(self, callbacks):
-        self._callbacks = callbacks
+    """Loopback ADT stub.
+
+    Requests are dispatched by ``(method, path prefix)``; the longest
+    matching prefix wins and the empty prefix acts as a catch-all. Routes,
+    latencies and bandwidth limits can be changed while the server runs and
+    are cleared by ``reset``, so one server can serve many tests.
+    """
+
+    def __init__(self, routes=None):
+        self._routes = _RouteTable(routes)
+        self._latency = _RouteTable()
+        self._bandwidth = _RouteTable()
+        self._released = threading.Event()
         self._server = None
         self._thread = None
         self.port = None
 
-    def __enter__(self):
-        callbacks = self._callbacks
+    def enqueue(self, method, prefix, callback):
+        """Route requests whose path starts with ``prefix`` to ``callback``."""
+        self._routes.add(method, prefix, callback)
 
-        class Handler(BaseHTTPRequestHandler):
-            def do_GET(self):
-                self._dispatch("GET")
+    def set_latency(self, method, prefix, seconds):
+        """Hold responses under ``prefix`` for up to ``seconds``.
 
-            def do_POST(self):
-                self._dispatch("POST")
+        Waiting handlers are released early by ``reset``, so a test can use
+        a generous delay to trip a client timeout without paying for it.
+        """
+        self._latency.add(method, prefix, seconds)
 
-            def log_message(self, fmt, *args):
-                return
+    def set_bandwidth(self, method, prefix, bytes_per_sec):
+        """Throttle response bodies under ``prefix`` to ``bytes_per_sec``."""
+        self._bandwidth.add(method, prefix, bytes_per_sec)
 
-            def _dispatch(self, method):
-                callback = callbacks.get((method, self.path))
-                if callback is None:
-                    callback = callbacks.get((method, "*"))
+    def reset(self):
+        """Drop all routes and timing knobs and release delayed handlers."""
+        self._routes.clear()
+        self._latency.clear()
+        self._bandwidth.clear()
+        self._released.set()
+        self._released = threading.Event()
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            # TCP_NODELAY on accepted sockets: small XML bodies must not sit
+            # in Nagle's buffer waiting for the client's delayed ACK.
+            disable_nagle_algorithm = True
+
+            def handle(self):
+                # Minimal HTTP/1.0 request parsing: callbacks only look at
+                # the method, path and a few headers, so the full email-based
+                # header parser of BaseHTTPRequestHandler is not needed.
+                parts = self.rfile.readline(_MAX_LINE).split()
+                if len(parts) != 3:
+                    return
+                self.command = parts[0].decode("latin-1")
+                self.path = parts[1].decode("latin-1")
+                self.headers = _Headers()
+                while True:
+                    line = self.rfile.readline(_MAX_LINE)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    self.headers[name.strip().lower()] = value.strip()
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+
+                released = stub._released
+                latency = stub._latency.match(self.command, self.path)
+                if latency and released.wait(latency):
+                    return
+                callback = stub._routes.match(self.command, self.path)
                 if callback is None:
-                    self.send_response(404)
-                    self.end_headers()
-                    self.wfile.write(b"not found")
+                    self._respond(*_NOT_FOUND)
                     return
-
-                status, headers, body = callback(self)
-                self.send_response(status)
-                for key, value in headers.items():
-                    self.send_header(key, value)
-                self.end_headers()
-                self.wfile.write(body.encode("utf-8"))
+                self._respond(*callback(self))
+
+            def _respond(self, status, headers, body):
+                # Status line, headers and body in a single write. An explicit
+                # Content-Length lets the client stop reading without waiting
+                # for EOF. The stub answers HTTP/1.0 and handles one request
+                # per connection, so the client reconnects for every request
+                # even though its sessions ask for keep-alive.
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                headers = {"Content-Length": str(len(body)), **headers}
+                try:
+                    reason = HTTPStatus(status).phrase
+                except ValueError:
+                    reason = ""
+                head = f"HTTP/1.0 {status} {reason}\r\n"
+                head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+                head = head.encode("latin-1") + b"\r\n"
+
+                rate = stub._bandwidth.match(self.command, self.path)
+                if not rate:
+                    self.wfile.write(head + body)
+                    return
+                self.wfile.write(head)
+                chunk = max(1, rate // 10)
+                released = stub._released
+                for offset in range(0, len(body), chunk):
+                    if released.wait(chunk / rate):
+                        return
+                    self.wfile.write(body[offset:offset + chunk])
 
         self._server = _ThreadingTcpServer(("127.0.0.1", 0), Handler)
         self.port = self._server.server_address[1]
@@ -66,6 +188,7 @@ class StubAdtServer:
         return self
 
     def __exit__(self, exc_type, exc, tb):
+        self._released.set()
         if self._server is not None:
             self._server.shutdown()
             self._server.server_close()
@@ -84,155 +207,189 @@ def _make_runner(port):
     )
 
 
-def test_contract_missing_location_header_for_async_activate():
-    def csrf(_):
-        return 200, {"x-csrf-token": "stub-token"}, "<discovery/>"
-
+def _xml(body):
+    return lambda _: (200, {"Content-Type": "application/xml"}, body)
+
+
+# Default route table for the auto-upstream contracts: query ZQ_SALES on
+# provider ZCP_SALES, a search feed with two DTP candidates, and both DTPs.
+_AUTO_UPSTREAM_ROUTES = {
+    "/sap/bw/modeling/query/zq_sales/a": _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<query:query xmlns:query=\"http://www.sap.com/bw/modeling/query\" "
+        "name=\"ZQ_SALES\" description=\"Sales\" infoProvider=\"ZCP_SALES\" "
+        "infoProviderType=\"HCPR\"/>"
+    ),
+    "/sap/bw/modeling/repo/is/bwsearch?": _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<feed xmlns=\"http://www.w3.org/2005/Atom\" "
+        "xmlns:bwModel=\"http://www.sap.com/bw/modeling\">"
+        "  <entry><title>DTP A</title><id>/sap/bw/modeling/dtpa/DTP_A/a</id>"
+        "    <content type=\"application/xml\">"
+        "      <bwModel:searchResult objectName=\"DTP_A\" objectType=\"DTPA\" objectVersion=\"A\" objectStatus=\"ACT\"/>"
+        "    </content>"
+        "  </entry>"
+        "  <entry><title>DTP B</title><id>/sap/bw/modeling/dtpa/DTP_B/a</id>"
+        "    <content type=\"application/xml\">"
+        "      <bwModel:searchResult objectName=\"DTP_B\" objectType=\"DTPA\" objectVersion=\"A\" objectStatus=\"ACT\"/>"
+        "    </content>"
+        "  </entry>"
+        "</feed>"
+    ),
+    "/sap/bw/modeling/dtpa/dtp_a/a": _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<dtpa name=\"DTP_A\">"
+        "<source objectName=\"ZSRC\" objectType=\"RSDS\" sourceSystem=\"LOCAL\"/>"
+        "<target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/>"
+        "</dtpa>"
+    ),
+    "/sap/bw/modeling/dtpa/dtp_b/a": _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<dtpa name=\"DTP_B\">"
+        "<source objectName=\"ZSRC\" objectType=\"RSDS\" sourceSystem=\"LOCAL\"/>"
+        "<target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/>"
+        "</dtpa>"
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    """One stub server for the whole module."""
+    with StubAdtServer() as server:
+        yield server
+
+
+@pytest.fixture
+def stub(stub_server):
+    """The shared stub server, reset after each test."""
+    yield stub_server
+    stub_server.reset()
+
+
+@pytest.fixture
+def auto_upstream_stub(stub):
+    """``stub`` loaded with the default auto-upstream routes.
+
+    Tests override individual routes with ``enqueue``.
+    """
+    for prefix, callback in _AUTO_UPSTREAM_ROUTES.items():
+        stub.enqueue("GET", prefix, callback)
+    return stub
+
+
+def _csrf(_):
+    return 200, {"x-csrf-token": "stub-token"}, "<discovery/>"
+
+
+def test_contract_missing_location_header_for_async_activate(stub):
     def activate(_):
         return 202, {}, "<accepted/>"
 
-    def post_dispatch(req):
-        if req.path.startswith("/sap/bc/adt/activation?method=activate"):
-            return activate(req)
-        return 404, {}, "not found"
-
-    callbacks = {
-        ("GET", "/sap/bc/adt/discovery"): csrf,
-        ("POST", "*"): post_dispatch,
-    }
+    stub.enqueue("GET", "/sap/bc/adt/discovery", _csrf)
+    stub.enqueue("POST", "/sap/bc/adt/activation?method=activate", activate)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("activate", "/sap/bc/adt/oo/classes/zcl_demo")
+    cli = _make_runner(stub.port)
+    result = cli.run("activate", "/sap/bc/adt/oo/classes/zcl_demo")
 
     assert result.returncode == 99
-    err = json.loads(result.stderr)["error"]
+    err = orjson.loads(result.stderr_bytes)["error"]
     assert "Location" in err["message"]
     assert err["exit_code"] == 99
 
 
-def test_contract_parse_failure_includes_line_diagnostics():
+def test_contract_parse_failure_includes_line_diagnostics(stub):
     def search(_):
         return 200, {"Content-Type": "application/xml"}, "<root>\n  <broken>\n</root>"
 
-    def get_dispatch(req):
-        if req.path.startswith(
-            "/sap/bc/adt/repository/informationsystem/search?operation=quickSearch&query="
-        ):
-            return search(req)
-        return 404, {}, "not found"
-
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
+    stub.enqueue(
+        "GET",
+        "/sap/bc/adt/repository/informationsystem/search?operation=quickSearch&query=",
+        search,
+    )
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("search", "query", "Z*")
+    cli = _make_runner(stub.port)
+    result = cli.run("search", "query", "Z*")
 
     assert result.returncode == 99
-    err = json.loads(result.stderr)["error"]
+    err = orjson.loads(result.stderr_bytes)["error"]
     assert "parse" in err["message"].lower()
 
 
-def test_contract_lock_conflict_maps_to_exit_6():
-    def csrf(_):
-        return 200, {"x-csrf-token": "stub-token"}, "<discovery/>"
-
+def test_contract_lock_conflict_maps_to_exit_6(stub):
     def lock(_):
         return 409, {}, "<error><message>locked</message></error>"
 
     def post_dispatch(req):
         if "_action=LOCK" in req.path:
             return lock(req)
-        return 404, {}, "not found"
+        return _NOT_FOUND
 
-    callbacks = {
-        ("GET", "/sap/bc/adt/discovery"): csrf,
-        ("POST", "*"): post_dispatch,
-    }
+    stub.enqueue("GET", "/sap/bc/adt/discovery", _csrf)
+    stub.enqueue("POST", "", post_dispatch)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("object", "lock", "/sap/bc/adt/oo/classes/zcl_demo")
+    cli = _make_runner(stub.port)
+    result = cli.run("object", "lock", "/sap/bc/adt/oo/classes/zcl_demo")
 
     assert result.returncode == 6
-    err = json.loads(result.stderr)["error"]
+    err = orjson.loads(result.stderr_bytes)["error"]
     assert err["category"] == "lock_conflict"
     assert err["exit_code"] == 6
 
 
-def test_contract_timeout_maps_to_exit_10():
-    def slow_discovery(_):
-        time.sleep(2)
-        return 200, {"Content-Type": "application/xml"}, "<root/>"
-
-    callbacks = {
-        ("GET", "/sap/bc/adt/discovery"): slow_discovery,
-    }
+def test_contract_timeout_maps_to_exit_10(stub):
+    # The delay is only an upper bound: the held handler is released when
+    # the fixture resets the stub, right after the CLI gives up.
+    stub.enqueue("GET", "/sap/bc/adt/discovery", _xml("<root/>"))
+    stub.set_latency("GET", "/sap/bc/adt/discovery", 5.0)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("discover", "services", extra_flags=["--timeout", "1"], timeout=20)
+    cli = _make_runner(stub.port)
+    result = cli.run("discover", "services", extra_flags=["--timeout", "1"], timeout=20)
 
     assert result.returncode == 10
-    err = json.loads(result.stderr)["error"]
+    err = orjson.loads(result.stderr_bytes)["error"]
     assert err["category"] == "timeout"
     assert err["exit_code"] == 10
 
 
-def test_contract_error_json_shape_is_stable():
-    with StubAdtServer({}) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("object", "lock", "not-a-uri")
+def test_contract_error_json_shape_is_stable(stub):
+    cli = _make_runner(stub.port)
+    result = cli.run("object", "lock", "not-a-uri")
 
     assert result.returncode == 99
-    payload = json.loads(result.stderr)
+    payload = orjson.loads(result.stderr_bytes)
     assert "error" in payload
     error = payload["error"]
     for key in ("category", "operation", "message", "exit_code"):
         assert key in error
 
 
-def test_contract_bw_read_query_not_found_maps_to_exit_2():
-    def get_dispatch(_):
-        return 404, {}, "not found"
-
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
-
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("bw", "read-query", "query", "ZQ_DOES_NOT_EXIST")
+def test_contract_bw_read_query_not_found_maps_to_exit_2(stub):
+    cli = _make_runner(stub.port)
+    result = cli.run("bw", "read-query", "query", "ZQ_DOES_NOT_EXIST")
 
     assert result.returncode == 2
-    err = json.loads(result.stderr)["error"]
+    err = orjson.loads(result.stderr_bytes)["error"]
     assert err["category"] == "not_found"
     assert err["exit_code"] == 2
 
 
-def test_contract_bw_read_query_parse_failure_maps_to_exit_99():
-    def get_dispatch(req):
-        if req.path.startswith("/sap/bw/modeling/query/"):
-            return 200, {"Content-Type": "application/xml"}, "<root>\n  <broken>\n</root>"
-        return 404, {}, "not found"
+def test_contract_bw_read_query_parse_failure_maps_to_exit_99(stub):
+    def query(_):
+        return 200, {"Content-Type": "application/xml"}, "<root>\n  <broken>\n</root>"
 
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
+    stub.enqueue("GET", "/sap/bw/modeling/query/", query)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("bw", "read-query", "query", "ZQ_PARSE_BROKEN")
+    cli = _make_runner(stub.port)
+    result = cli.run("bw", "read-query", "query", "ZQ_PARSE_BROKEN")
 
     assert result.returncode == 99
-    err = json.loads(result.stderr)["error"]
+    err = orjson.loads(result.stderr_bytes)["error"]
     assert "parse" in err["message"].lower()
     assert err["exit_code"] == 99
 
 
-def test_contract_bw_read_query_endpoint_templates_lowercase_name():
+def test_contract_bw_read_query_endpoint_templates_lowercase_name(stub):
     seen = []
 
     def get_dispatch(req):
@@ -244,43 +401,35 @@ def test_contract_bw_read_query_endpoint_templates_lowercase_name():
                 "name=\"ZQ_SALES\" description=\"Sales\"/>"
             )
             return 200, {"Content-Type": "application/xml"}, body
-        return 404, {}, "not found"
+        return _NOT_FOUND
 
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
+    stub.enqueue("GET", "", get_dispatch)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("bw", "read-query", "query", "ZQ_SALES")
+    cli = _make_runner(stub.port)
+    result = cli.run("bw", "read-query", "query", "ZQ_SALES")
 
     assert result.returncode == 0
     assert any("/sap/bw/modeling/query/zq_sales/a" in p for p in seen)
 
 
-def test_contract_bw_read_query_415_retries_accept_fallbacks():
+def test_contract_bw_read_query_415_retries_accept_fallbacks(stub):
     seen_accepts = []
 
-    def get_dispatch(req):
-        if req.path.startswith("/sap/bw/modeling/query/zvar_fiscyear/a"):
-            seen_accepts.append(req.headers.get("Accept", ""))
-            if len(seen_accepts) < 3:
-                return 415, {}, "unsupported media type"
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<query:variable xmlns:query=\"http://www.sap.com/bw/modeling/query\" "
-                "name=\"ZVAR_FISCYEAR\" description=\"Fiscal Year\"/>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        return 404, {}, "not found"
+    def variable(req):
+        seen_accepts.append(req.headers.get("Accept", ""))
+        if len(seen_accepts) < 3:
+            return 415, {}, "unsupported media type"
+        body = (
+            "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            "<query:variable xmlns:query=\"http://www.sap.com/bw/modeling/query\" "
+            "name=\"ZVAR_FISCYEAR\" description=\"Fiscal Year\"/>"
+        )
+        return 200, {"Content-Type": "application/xml"}, body
 
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
+    stub.enqueue("GET", "/sap/bw/modeling/query/zvar_fiscyear/a", variable)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("bw", "read-query", "variable", "ZVAR_FISCYEAR")
+    cli = _make_runner(stub.port)
+    result = cli.run("bw", "read-query", "variable", "ZVAR_FISCYEAR")
 
     assert result.returncode == 0
     assert seen_accepts[0] == "application/vnd.sap.bw.modeling.variable-v1_10_0+xml"
@@ -288,53 +437,34 @@ def test_contract_bw_read_query_415_retries_accept_fallbacks():
     assert seen_accepts[2] == "application/xml"
 
 
-def test_contract_bw_read_query_auto_upstream_planning_contract():
-    def get_dispatch(req):
-        if req.path.startswith("/sap/bw/modeling/query/zq_sales/a"):
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<query:query xmlns:query=\"http://www.sap.com/bw/modeling/query\" "
-                "name=\"ZQ_SALES\" description=\"Sales\" infoProvider=\"ZCP_SALES\" "
-                "infoProviderType=\"HCPR\"/>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        if req.path.startswith("/sap/bw/modeling/repo/is/bwsearch?"):
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<feed xmlns=\"http://www.w3.org/2005/Atom\" "
-                "xmlns:bwModel=\"http://www.sap.com/bw/modeling\">"
-                "  <entry>"
-                "    <title>DTP</title>"
-                "    <id>/sap/bw/modeling/dtpa/DTP_ZSALES/a</id>"
-                "    <content type=\"application/xml\">"
-                "      <bwModel:searchResult objectName=\"DTP_ZSALES\" objectType=\"DTPA\" "
-                "          objectVersion=\"A\" objectStatus=\"ACT\"/>"
-                "    </content>"
-                "  </entry>"
-                "</feed>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        if req.path.startswith("/sap/bw/modeling/dtpa/dtp_zsales/a"):
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<dtpa name=\"DTP_ZSALES\">"
-                "  <source objectName=\"ZSRC\" objectType=\"RSDS\" sourceSystem=\"LOCAL\"/>"
-                "  <target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/>"
-                "</dtpa>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        return 404, {}, "not found"
-
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
-
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run("bw", "read-query", "query", "ZQ_SALES", "--upstream=auto")
+def test_contract_bw_read_query_auto_upstream_planning_contract(auto_upstream_stub):
+    auto_upstream_stub.enqueue("GET", "/sap/bw/modeling/repo/is/bwsearch?", _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<feed xmlns=\"http://www.w3.org/2005/Atom\" "
+        "xmlns:bwModel=\"http://www.sap.com/bw/modeling\">"
+        "  <entry>"
+        "    <title>DTP</title>"
+        "    <id>/sap/bw/modeling/dtpa/DTP_ZSALES/a</id>"
+        "    <content type=\"application/xml\">"
+        "      <bwModel:searchResult objectName=\"DTP_ZSALES\" objectType=\"DTPA\" "
+        "          objectVersion=\"A\" objectStatus=\"ACT\"/>"
+        "    </content>"
+        "  </entry>"
+        "</feed>"
+    ))
+    auto_upstream_stub.enqueue("GET", "/sap/bw/modeling/dtpa/dtp_zsales/a", _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<dtpa name=\"DTP_ZSALES\">"
+        "  <source objectName=\"ZSRC\" objectType=\"RSDS\" sourceSystem=\"LOCAL\"/>"
+        "  <target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/>"
+        "</dtpa>"
+    ))
+
+    cli = _make_runner(auto_upstream_stub.port)
+    result = cli.run("bw", "read-query", "query", "ZQ_SALES", "--upstream=auto")
 
     assert result.returncode == 0
-    payload = json.loads(result.stdout)
+    payload = orjson.loads(result.stdout_bytes)
     upstream = payload.get("upstream_resolution", {})
     assert upstream.get("mode") == "auto"
     assert upstream.get("selected_dtp") == "DTP_ZSALES"
@@ -343,126 +473,42 @@ def test_contract_bw_read_query_auto_upstream_planning_contract():
     assert isinstance(upstream.get("candidates"), list)
 
 
-def test_contract_bw_read_query_auto_upstream_strict_ambiguous_fails():
-    def get_dispatch(req):
-        if req.path.startswith("/sap/bw/modeling/query/zq_sales/a"):
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<query:query xmlns:query=\"http://www.sap.com/bw/modeling/query\" "
-                "name=\"ZQ_SALES\" description=\"Sales\" infoProvider=\"ZCP_SALES\" "
-                "infoProviderType=\"HCPR\"/>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        if req.path.startswith("/sap/bw/modeling/repo/is/bwsearch?"):
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<feed xmlns=\"http://www.w3.org/2005/Atom\" "
-                "xmlns:bwModel=\"http://www.sap.com/bw/modeling\">"
-                "  <entry><title>DTP A</title><id>/sap/bw/modeling/dtpa/DTP_A/a</id>"
-                "    <content type=\"application/xml\">"
-                "      <bwModel:searchResult objectName=\"DTP_A\" objectType=\"DTPA\" objectVersion=\"A\" objectStatus=\"ACT\"/>"
-                "    </content>"
-                "  </entry>"
-                "  <entry><title>DTP B</title><id>/sap/bw/modeling/dtpa/DTP_B/a</id>"
-                "    <content type=\"application/xml\">"
-                "      <bwModel:searchResult objectName=\"DTP_B\" objectType=\"DTPA\" objectVersion=\"A\" objectStatus=\"ACT\"/>"
-                "    </content>"
-                "  </entry>"
-                "</feed>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        if req.path.startswith("/sap/bw/modeling/dtpa/dtp_a/a"):
-            return 200, {"Content-Type": "application/xml"}, (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<dtpa name=\"DTP_A\"><target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/></dtpa>"
-            )
-        if req.path.startswith("/sap/bw/modeling/dtpa/dtp_b/a"):
-            return 200, {"Content-Type": "application/xml"}, (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<dtpa name=\"DTP_B\"><target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/></dtpa>"
-            )
-        return 404, {}, "not found"
-
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
-
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run(
-            "bw", "read-query", "query", "ZQ_SALES", "--upstream=auto", "--lineage-strict"
-        )
+def test_contract_bw_read_query_auto_upstream_strict_ambiguous_fails(auto_upstream_stub):
+    cli = _make_runner(auto_upstream_stub.port)
+    result = cli.run(
+        "bw", "read-query", "query", "ZQ_SALES", "--upstream=auto", "--lineage-strict"
+    )
 
     assert result.returncode == 99
     assert "strict upstream resolution failed" in result.stderr.lower()
 
 
-def test_contract_bw_read_query_auto_upstream_ambiguous_composes_all_candidates():
-    def get_dispatch(req):
-        if req.path.startswith("/sap/bw/modeling/query/zq_sales/a"):
-            body = (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<query:query xmlns:query=\"http://www.sap.com/bw/modeling/query\" "
-                "name=\"ZQ_SALES\" description=\"Sales\" infoProvider=\"ZCP_SALES\" "
-                "infoProviderType=\"HCPR\"/>"
-            )
-            return 200, {"Content-Type": "application/xml"}, body
-        if req.path.startswith("/sap/bw/modeling/repo/is/bwsearch?"):
-            if "objectType=TRFN" in req.path:
-                return 200, {"Content-Type": "application/xml"}, (
-                    "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                    "<feed xmlns=\"http://www.w3.org/2005/Atom\"/>"
-                )
-            return 200, {"Content-Type": "application/xml"}, (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<feed xmlns=\"http://www.w3.org/2005/Atom\" "
-                "xmlns:bwModel=\"http://www.sap.com/bw/modeling\">"
-                "  <entry><title>DTP A</title><id>/sap/bw/modeling/dtpa/DTP_A/a</id>"
-                "    <content type=\"application/xml\">"
-                "      <bwModel:searchResult objectName=\"DTP_A\" objectType=\"DTPA\" objectVersion=\"A\" objectStatus=\"ACT\"/>"
-                "    </content>"
-                "  </entry>"
-                "  <entry><title>DTP B</title><id>/sap/bw/modeling/dtpa/DTP_B/a</id>"
-                "    <content type=\"application/xml\">"
-                "      <bwModel:searchResult objectName=\"DTP_B\" objectType=\"DTPA\" objectVersion=\"A\" objectStatus=\"ACT\"/>"
-                "    </content>"
-                "  </entry>"
-                "</feed>"
-            )
-        if req.path.startswith("/sap/bw/modeling/dtpa/dtp_a/a"):
-            return 200, {"Content-Type": "application/xml"}, (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<dtpa name=\"DTP_A\">"
-                "<source objectName=\"ZSRC\" objectType=\"RSDS\" sourceSystem=\"LOCAL\"/>"
-                "<target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/>"
-                "</dtpa>"
-            )
-        if req.path.startswith("/sap/bw/modeling/dtpa/dtp_b/a"):
-            return 200, {"Content-Type": "application/xml"}, (
-                "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
-                "<dtpa name=\"DTP_B\">"
-                "<source objectName=\"ZSRC\" objectType=\"RSDS\" sourceSystem=\"LOCAL\"/>"
-                "<target objectName=\"ZCP_SALES\" objectType=\"HCPR\"/>"
-                "</dtpa>"
-            )
-        return 404, {}, "not found"
+def test_contract_bw_read_query_auto_upstream_ambiguous_composes_all_candidates(
+    auto_upstream_stub,
+):
+    ambiguous_feed = _AUTO_UPSTREAM_ROUTES["/sap/bw/modeling/repo/is/bwsearch?"]
+    empty_feed = _xml(
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<feed xmlns=\"http://www.w3.org/2005/Atom\"/>"
+    )
 
-    callbacks = {
-        ("GET", "*"): get_dispatch,
-    }
+    def search(req):
+        if "objectType=TRFN" in req.path:
+            return empty_feed(req)
+        return ambiguous_feed(req)
 
-    with StubAdtServer(callbacks) as server:
-        cli = _make_runner(server.port)
-        result = cli.run(
-            "bw", "read-query", "query", "ZQ_SALES",
-            "--upstream=auto", "--upstream-no-xref", "--json-shape=truth"
-        )
+    auto_upstream_stub.enqueue("GET", "/sap/bw/modeling/repo/is/bwsearch?", search)
+
+    cli = _make_runner(auto_upstream_stub.port)
+    result = cli.run(
+        "bw", "read-query", "query", "ZQ_SALES",
+        "--upstream=auto", "--upstream-no-xref", "--json-shape=truth"
+    )
 
     assert result.returncode == 0
-    payload = json.loads(result.stdout)
+    payload = orjson.loads(result.stdout_bytes)
     resolution = payload.get("resolution", {})
     assert resolution.get("ambiguous") is True
     assert sorted(resolution.get("composed_candidates", [])) == ["DTP_A", "DTP_B"]
     assert isinstance(payload.get("provenance"), list)
     assert any(p.startswith("bw.lineage.compose") for p in payload["provenance"])
-
@@ -1,10 +1,19 @@
 """BW read command tests — generic object read and all-types regression."""
 
-import json
-
+import orjson
 import pytest
 
 
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _looks_like_xml(buf):
+    """True if ``buf`` starts with markup after an optional BOM and blanks."""
+    if buf.startswith(_UTF8_BOM):
+        buf = buf[len(_UTF8_BOM):]
+    return buf.lstrip()[:1] == b"<"
+
+
 # ===========================================================================
 # BW Read Object
 # ===========================================================================
@@ -12,55 +21,47 @@ import pytest
 @pytest.mark.bw
 class TestBwRead:
 
-    @pytest.fixture(scope="class")
-    def known_object(self, cli, bw_has_search):
-        """Find a known active ADSO to use for read tests."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1",
-                          "--type", "ADSO")
-        if not data:
-            pytest.skip("No ADSO objects found for read tests")
-        return data[0]
-
-    def test_read_object(self, cli, bw_has_adso, known_object):
+    def test_read_object(self, cli, bw_has_adso, known_adso):
         """bw read returns object metadata."""
-        name = known_object["name"]
+        name = known_adso["name"]
         data = cli.run_ok("bw", "read", "ADSO", name)
         assert data["name"] == name
         assert data["type"] == "ADSO"
 
-    def test_read_has_metadata_fields(self, cli, bw_has_adso, known_object):
+    def test_read_has_metadata_fields(self, cli, bw_has_adso, known_adso):
         """Read result includes standard metadata fields."""
-        name = known_object["name"]
+        name = known_adso["name"]
         data = cli.run_ok("bw", "read", "ADSO", name)
         assert "name" in data
         assert "type" in data
         assert "version" in data
 
-    def test_read_active_version(self, cli, bw_has_adso, known_object):
+    def test_read_active_version(self, cli, bw_has_adso, known_adso):
         """Read with --version=a returns active version."""
-        name = known_object["name"]
+        name = known_adso["name"]
         data = cli.run_ok("bw", "read", "ADSO", name, "--version", "a")
         assert data["name"] == name
 
-    def test_read_raw_xml(self, cli, bw_has_adso, known_object):
+    def test_read_raw_xml(self, cli, bw_has_adso, known_adso):
         """bw read --raw returns XML content."""
-        name = known_object["name"]
+        name = known_adso["name"]
         result = cli.run_no_json("bw", "read", "ADSO", name, "--raw")
         assert result.returncode == 0
-        assert "<?xml" in result.stdout or "<" in result.stdout
+        assert _looks_like_xml(result.stdout_bytes)
 
     def test_read_nonexistent_object(self, cli, bw_has_adso):
         """Reading a nonexistent object returns exit code 2 (not found)."""
         result = cli.run("bw", "read", "ADSO", "ZZZZZ_NONEXISTENT_99999")
         assert result.returncode == 2
 
-    def test_read_human_readable(self, cli, bw_has_adso, known_object):
+    def test_read_human_readable(self, cli, bw_has_adso, known_adso):
         """bw read without --json prints human-readable summary."""
-        name = known_object["name"]
+        name = known_adso["name"]
         result = cli.run_no_json("bw", "read", "ADSO", name)
         assert result.returncode == 0
         assert name in result.stdout
 
+    @pytest.mark.no_backend
     def test_read_missing_args(self, cli):
         """bw read without type and name fails."""
         result = cli.run("bw", "read")
@@ -71,6 +72,18 @@ class TestBwRead:
 # BW Read All Types (content type regression)
 # ===========================================================================
 
+# Discovery term -> TLOGO for every type `bw read` supports.
+_TERM_TO_TLOGO = {
+    "adso": "ADSO", "iobj": "IOBJ", "hcpr": "HCPR",
+    "trfn": "TRFN", "dtpa": "DTPA", "rsds": "RSDS",
+    "query": "QUERY", "dest": "DEST", "lsys": "LSYS",
+    "fbp": "FBP", "dmod": "DMOD", "trcs": "TRCS",
+    "doca": "DOCA", "segr": "SEGR", "area": "AREA",
+    "ctrt": "CTRT", "uomt": "UOMT", "thjt": "THJT",
+}
+_READABLE_TERMS = frozenset(_TERM_TO_TLOGO)
+
+
 @pytest.mark.bw
 class TestBwReadAllTypes:
     """Test bw read for all discoverable BW object types.
@@ -79,41 +92,38 @@ class TestBwReadAllTypes:
     This catches Accept header 406 errors across all types.
     """
 
-    TERM_TO_TLOGO = {
-        "adso": "ADSO", "iobj": "IOBJ", "hcpr": "HCPR",
-        "trfn": "TRFN", "dtpa": "DTPA", "rsds": "RSDS",
-        "query": "QUERY", "dest": "DEST", "lsys": "LSYS",
-        "fbp": "FBP", "dmod": "DMOD", "trcs": "TRCS",
-        "doca": "DOCA", "segr": "SEGR", "area": "AREA",
-        "ctrt": "CTRT", "uomt": "UOMT", "thjt": "THJT",
-    }
-
     @pytest.fixture(scope="class")
-    def discoverable_types(self, cli, bw_has_search):
+    def discoverable_types(self, bw_terms, bw_search_cache):
         """Return list of (tlogo, name) pairs for types with objects."""
-        data = cli.run_ok("bw", "discover")
-        terms = {s.get("term", "") for s in data}
-        readable_terms = terms & set(self.TERM_TO_TLOGO.keys())
-
         found = []
-        for term in sorted(readable_terms):
-            tlogo = self.TERM_TO_TLOGO[term]
-            result = cli.run("bw", "search", "*", "--max", "1",
-                             "--type", tlogo)
-            if result.returncode == 0:
-                stdout = result.stdout.strip()
-                objs = json.loads(stdout) if stdout else []
-                if objs:
-                    found.append((tlogo, objs[0]["name"]))
+        for term in sorted(bw_terms & _READABLE_TERMS):
+            tlogo = _TERM_TO_TLOGO[term]
+            objs = bw_search_cache[tlogo]
+            if objs:
+                found.append((tlogo, objs[0]["name"]))
         if not found:
             pytest.skip("No readable BW objects found")
         return found
 
-    def test_read_each_type_succeeds(self, cli, discoverable_types):
+    @pytest.fixture(scope="class")
+    def read_results(self, cli, discoverable_types):
+        """Plain and --raw ``bw read`` results per type, fetched in one sweep.
+
+        Returns ``(plain, raw)`` lists aligned with ``discoverable_types``.
+        """
+        plain = cli.run_many(
+            [("bw", "read", tlogo, name) for tlogo, name in discoverable_types])
+        raw = cli.run_many(
+            [("bw", "read", tlogo, name, "--raw")
+             for tlogo, name in discoverable_types],
+            runner=cli.run_no_json)
+        return plain, raw
+
+    def test_read_each_type_succeeds(self, discoverable_types, read_results):
         """bw read succeeds for every discovered object type."""
+        results, _ = read_results
         failures = []
-        for tlogo, name in discoverable_types:
-            result = cli.run("bw", "read", tlogo, name)
+        for (tlogo, name), result in zip(discoverable_types, results):
             if result.returncode != 0:
                 failures.append(
                     f"{tlogo} {name}: exit={result.returncode}, "
@@ -122,20 +132,22 @@ class TestBwReadAllTypes:
             f"bw read failed for {len(failures)}/{len(discoverable_types)} "
             f"types:\n" + "\n".join(failures))
 
-    def test_read_each_type_returns_valid_json(self, cli, discoverable_types):
+    def test_read_each_type_returns_valid_json(self, discoverable_types,
+                                               read_results):
         """bw read returns valid JSON with name/type for each type."""
-        for tlogo, name in discoverable_types:
-            result = cli.run("bw", "read", tlogo, name)
+        results, _ = read_results
+        for (tlogo, _), result in zip(discoverable_types, results):
             if result.returncode != 0:
                 continue
-            data = json.loads(result.stdout.strip())
+            data = orjson.loads(result.stdout_bytes)
             assert "name" in data, f"{tlogo}: missing 'name'"
             assert "type" in data, f"{tlogo}: missing 'type'"
 
-    def test_read_each_type_raw_xml(self, cli, discoverable_types):
+    def test_read_each_type_raw_xml(self, discoverable_types, read_results):
         """bw read --raw returns XML for each type."""
-        for tlogo, name in discoverable_types:
-            result = cli.run_no_json("bw", "read", tlogo, name, "--raw")
+        _, results = read_results
+        for (tlogo, _), result in zip(discoverable_types, results):
             if result.returncode != 0:
                 continue
-            assert "<" in result.stdout, f"{tlogo}: --raw didn't return XML"
+            assert _looks_like_xml(result.stdout_bytes), (
+                f"{tlogo}: --raw didn't return XML")
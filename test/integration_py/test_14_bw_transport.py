@@ -1,10 +1,14 @@
 """BW transport and job command tests."""
 
-import json
-
+import orjson
 import pytest
 
 
+def _requests_missing_tasks(data):
+    """Numbers of transport requests in ``data`` that lack a tasks array."""
+    return [r.get("number") for r in data["requests"] if "tasks" not in r]
+
+
 # ===========================================================================
 # BW Transport (read-only: check/list)
 # ===========================================================================
@@ -12,20 +16,22 @@ import pytest
 @pytest.mark.bw
 class TestBwTransport:
 
-    def test_transport_check(self, cli, bw_has_cto):
+    @pytest.fixture(scope="class")
+    def transport_check(self, cli, bw_has_cto):
+        """Parsed ``bw transport check`` output, fetched once for the class."""
+        return cli.run_ok("bw", "transport", "check")
+
+    def test_transport_check(self, transport_check):
         """bw transport check returns transport state."""
-        data = cli.run_ok("bw", "transport", "check")
-        assert "writing_enabled" in data
+        assert "writing_enabled" in transport_check
 
-    def test_transport_check_has_fields(self, cli, bw_has_cto):
+    def test_transport_check_has_fields(self, transport_check):
         """Transport check result has changeability, objects, and requests."""
-        data = cli.run_ok("bw", "transport", "check")
+        data = transport_check
         assert "changeability" in data
         assert "requests" in data
         assert "objects" in data
-        # Each request should have a tasks array
-        for r in data["requests"]:
-            assert "tasks" in r, f"Request {r.get('number')} missing tasks"
+        assert not _requests_missing_tasks(data)
 
     def test_transport_list(self, cli, bw_has_cto):
         """bw transport list returns request data with tasks."""
@@ -33,9 +39,7 @@ class TestBwTransport:
         assert "writing_enabled" in data
         assert "requests" in data
         assert isinstance(data["requests"], list)
-        # Each request should have a tasks array
-        for r in data["requests"]:
-            assert "tasks" in r, f"Request {r.get('number')} missing tasks"
+        assert not _requests_missing_tasks(data)
 
     def test_transport_list_own_only(self, cli, bw_has_cto):
         """bw transport list --own-only filters to current user."""
@@ -60,11 +64,13 @@ class TestBwTransport:
                           "--rddetails", "objs", "--rdprops", "--allmsgs")
         assert "writing_enabled" in data
 
+    @pytest.mark.no_backend
     def test_transport_write_missing_transport(self, cli):
         """bw transport write without --transport fails with usage error."""
         result = cli.run("bw", "transport", "write", "ADSO", "ZSALES")
         assert result.returncode != 0
 
+    @pytest.mark.no_backend
     def test_transport_missing_subaction(self, cli):
         """bw transport without sub-action fails."""
         result = cli.run("bw", "transport")
@@ -79,32 +85,23 @@ class TestBwTransport:
 class TestBwTransportCollect:
 
     @pytest.fixture(scope="class")
-    def known_adso(self, cli, bw_has_search):
-        """Find a known ADSO for collect tests."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1",
-                          "--type", "ADSO")
-        if not data:
-            pytest.skip("No ADSO objects found for collect test")
-        return data[0]
-
-    def test_transport_collect(self, cli, bw_has_cto, known_adso):
-        """bw transport collect returns collection results."""
-        name = known_adso["name"]
-        result = cli.run("bw", "transport", "collect", "ADSO", name)
+    def collect_result(self, cli, bw_has_cto, known_adso):
+        """Parsed ``bw transport collect`` for the known ADSO, run once."""
+        result = cli.run("bw", "transport", "collect", "ADSO",
+                         known_adso["name"])
         if result.returncode != 0:
             pytest.skip("BW transport collect not supported on this system")
-        cr = json.loads(result.stdout.strip())
+        return orjson.loads(result.stdout_bytes)
+
+    def test_transport_collect(self, collect_result):
+        """bw transport collect returns collection results."""
+        cr = collect_result
         assert "details" in cr
         assert "dependencies" in cr
 
-    def test_transport_collect_dependencies_structure(self, cli, bw_has_cto,
-                                                      known_adso):
+    def test_transport_collect_dependencies_structure(self, collect_result):
         """Transport collect dependencies have expected fields."""
-        name = known_adso["name"]
-        result = cli.run("bw", "transport", "collect", "ADSO", name)
-        if result.returncode != 0:
-            pytest.skip("BW transport collect not supported")
-        cr = json.loads(result.stdout.strip())
+        cr = collect_result
         assert isinstance(cr["dependencies"], list)
         if cr["dependencies"]:
             dep = cr["dependencies"][0]
@@ -119,7 +116,7 @@ class TestBwTransportCollect:
                          "--mode", "001")
         if result.returncode != 0:
             pytest.skip("BW transport collect --mode=001 not supported")
-        cr = json.loads(result.stdout.strip())
+        cr = orjson.loads(result.stdout_bytes)
         assert isinstance(cr, dict)
         assert "details" in cr
 
@@ -138,9 +135,10 @@ class TestBwTransportCollect:
                          "ZZZZZ_NONEXISTENT_99999")
         # May fail with not-found or return empty — both are acceptable
         if result.returncode == 0:
-            cr = json.loads(result.stdout.strip())
+            cr = orjson.loads(result.stdout_bytes)
             assert isinstance(cr, dict)
 
+    @pytest.mark.no_backend
     def test_transport_collect_missing_args(self, cli):
         """bw transport collect without type and name fails."""
         result = cli.run("bw", "transport", "collect")
@@ -154,17 +152,6 @@ class TestBwTransportCollect:
 @pytest.mark.bw
 class TestBwJobs:
 
-    @pytest.fixture(scope="class")
-    def bw_jobs_available(self, cli, bw_available):
-        result = cli.run("bw", "job", "list")
-        if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
-                pytest.skip("BW jobs service not activated")
-            pytest.skip("BW jobs service unavailable on this system")
-        data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
-        return data
-
     def test_job_list_returns_array(self, cli, bw_jobs_available):
         assert isinstance(bw_jobs_available, list)
 
@@ -182,10 +169,12 @@ class TestBwJobs:
         data = cli.run_ok("bw", "job", "result", guid)
         assert data.get("guid") == guid
 
+    @pytest.mark.no_backend
     def test_job_step_validates_args(self, cli):
         result = cli.run("bw", "job", "step", "GUID_ONLY")
         assert result.returncode != 0
 
+    @pytest.mark.no_backend
     def test_job_missing_subaction(self, cli):
         """bw job without sub-action fails."""
         result = cli.run("bw", "job")
@@ -1,9 +1,9 @@
 """BW xref and nodes command tests."""
 
-import json
-
 import pytest
 
+from cli_runner import parse_stdout
+
 
 # ===========================================================================
 # BW Cross-References (xref)
@@ -12,35 +12,13 @@ import pytest
 @pytest.mark.bw
 class TestBwXref:
 
-    @pytest.fixture(scope="class")
-    def bw_has_xref(self, cli, bw_has_search):
-        """Check if BW xref endpoint is accessible using a real object."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1")
-        if not data:
-            pytest.skip("No BW objects found to probe xref")
-        result = cli.run("bw", "xref", data[0]["type"], data[0]["name"])
-        if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
-                pytest.skip("BW xref service not activated")
-        return True
-
-    @pytest.fixture(scope="class")
-    def known_adso(self, cli, bw_has_search):
-        """Find a known ADSO for xref tests."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1",
-                          "--type", "ADSO")
-        if not data:
-            pytest.skip("No ADSO objects found for xref test")
-        return data[0]
-
     def test_xref_returns_list(self, cli, bw_has_xref, known_adso):
         """bw xref returns a list for a known object."""
         name = known_adso["name"]
         result = cli.run("bw", "xref", "ADSO", name)
         if result.returncode != 0:
             pytest.skip("BW xref not fully supported on this system")
-        xrefs = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        xrefs = parse_stdout(result, [])
         assert isinstance(xrefs, list)
 
     def test_xref_result_has_fields(self, cli, bw_has_xref, known_adso):
@@ -49,7 +27,7 @@ class TestBwXref:
         result = cli.run("bw", "xref", "ADSO", name)
         if result.returncode != 0:
             pytest.skip("BW xref not supported")
-        xrefs = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        xrefs = parse_stdout(result, [])
         if not xrefs:
             pytest.skip("No cross-references found")
         r = xrefs[0]
@@ -72,7 +50,7 @@ class TestBwXref:
         result = cli.run("bw", "xref", "ADSO", name, "--association", "001")
         if result.returncode != 0:
             pytest.skip("BW xref not supported")
-        xrefs = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        xrefs = parse_stdout(result, [])
         assert isinstance(xrefs, list)
         # If we got results, they should all have the filtered association
         for r in xrefs:
@@ -84,10 +62,11 @@ class TestBwXref:
         result = cli.run("bw", "xref", "ADSO", "ZZZZZ_NONEXISTENT_99999")
         if result.returncode == 0:
             # BW xref returns empty list for unknown objects
-            data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+            data = parse_stdout(result, [])
             assert data == []
         # else: error exit code is also acceptable
 
+    @pytest.mark.no_backend
     def test_xref_missing_args(self, cli):
         """bw xref without type and name fails."""
         result = cli.run("bw", "xref")
@@ -101,35 +80,13 @@ class TestBwXref:
 @pytest.mark.bw
 class TestBwNodes:
 
-    @pytest.fixture(scope="class")
-    def bw_has_nodes(self, cli, bw_has_search):
-        """Check if BW nodes endpoint is accessible using a real object."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1")
-        if not data:
-            pytest.skip("No BW objects found to probe nodes")
-        result = cli.run("bw", "nodes", data[0]["type"], data[0]["name"])
-        if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
-                pytest.skip("BW nodes service not activated")
-        return True
-
-    @pytest.fixture(scope="class")
-    def known_adso(self, cli, bw_has_search):
-        """Find a known ADSO for nodes tests."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1",
-                          "--type", "ADSO")
-        if not data:
-            pytest.skip("No ADSO objects found for nodes test")
-        return data[0]
-
     def test_nodes_returns_list(self, cli, bw_has_nodes, known_adso):
         """bw nodes returns a list for a known object."""
         name = known_adso["name"]
         result = cli.run("bw", "nodes", "ADSO", name)
         if result.returncode != 0:
             pytest.skip("BW nodes not fully supported on this system")
-        nodes = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        nodes = parse_stdout(result, [])
         assert isinstance(nodes, list)
 
     def test_nodes_result_has_fields(self, cli, bw_has_nodes, known_adso):
@@ -138,7 +95,7 @@ class TestBwNodes:
         result = cli.run("bw", "nodes", "ADSO", name)
         if result.returncode != 0:
             pytest.skip("BW nodes not supported")
-        nodes = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        nodes = parse_stdout(result, [])
         if not nodes:
             pytest.skip("No child nodes found")
         n = nodes[0]
@@ -161,18 +118,18 @@ class TestBwNodes:
                          "--child-type", "TRFN")
         if result.returncode != 0:
             pytest.skip("BW nodes not supported")
-        nodes = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        nodes = parse_stdout(result, [])
         assert isinstance(nodes, list)
         # If we got results, they should all match the filter
         for n in nodes:
             assert n["type"] == "TRFN", \
                 f"Expected type TRFN, got {n['type']}"
 
-    def test_nodes_datasource_flag(self, cli, bw_has_nodes, bw_has_search):
+    def test_nodes_datasource_flag(self, cli, bw_has_nodes, bw_search_cache):
         """bw nodes --datasource uses DataSource path."""
         # Find a DataSource (RSDS) if available
-        data = cli.run_ok("bw", "search", "*", "--max", "1",
-                          "--type", "RSDS")
+        data = bw_search_cache["RSDS"]
+        assert data is not None, "bw search --type RSDS failed"
         if not data:
             pytest.skip("No RSDS objects found for datasource test")
         name = data[0]["name"]
@@ -180,7 +137,7 @@ class TestBwNodes:
         # Just verify it runs without error (may return empty list)
         if result.returncode != 0:
             pytest.skip("BW nodes --datasource not supported")
-        nodes = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        nodes = parse_stdout(result, [])
         assert isinstance(nodes, list)
 
     def test_nodes_nonexistent_object(self, cli, bw_has_nodes):
@@ -188,10 +145,11 @@ class TestBwNodes:
         result = cli.run("bw", "nodes", "ADSO", "ZZZZZ_NONEXISTENT_99999")
         if result.returncode == 0:
             # BW nodes returns empty list for unknown objects
-            data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+            data = parse_stdout(result, [])
             assert data == []
         # else: error exit code is also acceptable
 
+    @pytest.mark.no_backend
     def test_nodes_missing_args(self, cli):
         """bw nodes without type and name fails."""
         result = cli.run("bw", "nodes")
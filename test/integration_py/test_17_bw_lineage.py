@@ -1,12 +1,141 @@
 """BW lineage command tests — read-adso, read-trfn, read-dtp, read-rsds, read-query, read-dmod, lineage."""
 
-import json
+import re
 import shutil
 import subprocess
-import tempfile
 
+import fastjsonschema
+import orjson
 import pytest
 
+from cli_runner import not_activated
+
+
+# SAP demo query shipped with the BW content; absent on some landscapes.
+_DEMO_QUERY = "0D_FC_NW_C01_Q0007"
+
+# Decided at collection so the render test skips before any BW fixture runs.
+requires_mmdc = pytest.mark.skipif(shutil.which("mmdc") is None,
+                                   reason="mmdc not installed")
+
+# Keys each read-* JSON contract must carry.
+_ADSO_FIELD_KEYS = frozenset({"name", "data_type", "key"})
+_CONNECTION_KEYS = frozenset({
+    "name", "source_name", "source_type", "target_name", "target_type",
+})
+_TRFN_FIELD_KEYS = frozenset({"source_fields", "target_fields", "rules"})
+_TRFN_RULE_KEYS = frozenset({"source_field", "target_field", "rule_type"})
+_TRFN_STEP_KEYS = frozenset({
+    "start_routine", "end_routine", "expert_routine", "hana_runtime",
+})
+_TRFN_GROUP_KEYS = frozenset({
+    "source_fields", "target_fields", "group_id", "group_type",
+    "step_attributes",
+})
+_DTP_CONTRACT_KEYS = frozenset({
+    "type", "request_selection_mode", "extraction_settings",
+    "execution_settings", "runtime_properties", "error_handling",
+    "dtp_execution", "semantic_group_fields", "filter_fields", "program_flow",
+})
+
+
+# JSON schemas for the graph-shaped contracts, compiled once at import.
+_ARRAY = {"type": "array"}
+_QUERY_COMPONENT_SCHEMA = {
+    "type": "object",
+    "required": ["name", "component_type", "schema_version", "root_node_id",
+                 "metadata", "nodes", "edges", "references"],
+    "properties": {
+        "component_type": {"const": "QUERY"},
+        "schema_version": {"const": "1.0"},
+        "root_node_id": {"type": "string", "minLength": 1},
+        "metadata": {"type": "object"},
+        "nodes": {"type": "array", "items": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {"id": {"type": "string"}},
+        }},
+        "edges": {"type": "array", "items": {
+            "type": "object",
+            "required": ["from", "to"],
+            "properties": {"from": {"type": "string"},
+                           "to": {"type": "string"}},
+        }},
+        "references": _ARRAY,
+    },
+}
+_QUERY_CATALOG_SCHEMA = {
+    "type": "object",
+    "required": ["contract", "schema_version", "nodes", "edges", "metrics"],
+    "properties": {
+        "contract": {"const": "bw.query.catalog"},
+        "schema_version": {"const": "2.0"},
+        "nodes": {"type": "array", "items": {
+            "type": "object",
+            "required": ["node_id", "business_key", "object_type",
+                         "object_name", "source_component_type",
+                         "source_component_name"],
+        }},
+        "edges": _ARRAY,
+        "metrics": {
+            "type": "object",
+            "required": ["node_count", "edge_count", "ergonomics_flags"],
+            "properties": {
+                "node_count": {"type": "integer"},
+                "edge_count": {"type": "integer"},
+                "ergonomics_flags": _ARRAY,
+            },
+        },
+    },
+}
+_DMOD_TOPOLOGY_SCHEMA = {
+    "type": "object",
+    "required": ["name", "nodes", "connections"],
+    "properties": {"nodes": _ARRAY, "connections": _ARRAY},
+}
+_LINEAGE_GRAPH_SCHEMA = {
+    "type": "object",
+    "required": ["schema_version", "root", "nodes", "edges", "provenance",
+                 "warnings"],
+    "properties": {
+        "schema_version": {"const": "1.0"},
+        "root": {
+            "type": "object",
+            "required": ["type", "name"],
+            "properties": {"type": {"const": "DTPA"}},
+        },
+        "nodes": _ARRAY,
+        "edges": _ARRAY,
+        "provenance": _ARRAY,
+        "warnings": _ARRAY,
+    },
+}
+_validate_query_component = fastjsonschema.compile(_QUERY_COMPONENT_SCHEMA)
+_validate_query_catalog = fastjsonschema.compile(_QUERY_CATALOG_SCHEMA)
+_validate_dmod_topology = fastjsonschema.compile(_DMOD_TOPOLOGY_SCHEMA)
+_validate_lineage_graph = fastjsonschema.compile(_LINEAGE_GRAPH_SCHEMA)
+
+
+# Validation and lookup errors reported on stderr.
+_INVALID_OPTION_RE = re.compile(rb"invalid --([\w-]+)", re.IGNORECASE)
+_NOT_FOUND_RE = re.compile(rb"not found", re.IGNORECASE)
+_UNSUPPORTED_COMPONENT_RE = re.compile(rb"unsupported query component type",
+                                       re.IGNORECASE)
+_QUERY_ONLY_RE = re.compile(rb"only supported for query components",
+                            re.IGNORECASE)
+
+
+def _invalid_option(result):
+    """Option named by an ``invalid --<option>`` error, lower-cased."""
+    m = _INVALID_OPTION_RE.search(result.stderr_bytes)
+    return m.group(1).lower().decode() if m else None
+
+
+def _assert_keys(data, required):
+    """Assert ``data`` has every key in ``required``; report all missing."""
+    missing = required - data.keys()
+    assert not missing, f"missing keys: {sorted(missing)}"
+
 
 # ===========================================================================
 # BW Lineage: read-adso, read-trfn, read-dtp, read-rsds, read-query, read-dmod
@@ -16,150 +145,75 @@ import pytest
 class TestBwLineage:
 
     @pytest.fixture(scope="class")
-    def known_adso(self, cli, bw_has_search):
-        """Find a known ADSO for lineage tests."""
-        data = cli.run_ok("bw", "search", "*", "--max", "1",
-                          "--type", "ADSO")
-        if not data:
-            pytest.skip("No ADSO found")
-        return data[0]["name"]
-
-    @pytest.fixture(scope="class")
-    def known_trfn(self, cli, bw_has_search):
-        """Find a known transformation that is actually readable."""
-        data = cli.run_ok("bw", "search", "*", "--max", "10",
-                          "--type", "TRFN")
-        if not data:
-            pytest.skip("No TRFN found")
-        # Search index may be stale — probe read endpoint
-        for r in data:
-            result = cli.run("bw", "read-trfn", r["name"])
-            if result.returncode == 0:
-                return r["name"]
-        pytest.skip("No readable TRFN found (search results return 404)")
+    def demo_query(self, cli, bw_has_search):
+        """Parsed ``read-query`` JSON for the demo query, fetched once.
 
-    @pytest.fixture(scope="class")
-    def known_dtp(self, cli, bw_has_search):
-        """Find a known DTP that is actually readable."""
-        data = cli.run_ok("bw", "search", "*", "--max", "10",
-                          "--type", "DTPA")
-        if not data:
-            pytest.skip("No DTPA found")
-        # Search index may be stale — probe read endpoint
-        for r in data:
-            result = cli.run("bw", "read-dtp", r["name"])
-            if result.returncode == 0:
-                return r["name"]
-        pytest.skip("No readable DTPA found (search results return 404)")
+        Tests that need the demo query depend on this instead of probing
+        for it themselves; it skips when the query is not installed.
+        """
+        result = cli.run("bw", "read-query", "query", _DEMO_QUERY)
+        if result.returncode != 0:
+            pytest.skip("Known demo query not available in this landscape")
+        return orjson.loads(result.stdout_bytes)
 
-    @pytest.fixture(scope="class")
-    def known_rsds(self, cli, bw_has_search):
-        """Find a known RSDS with source-system info from URI."""
-        data = cli.run_ok("bw", "search", "*", "--max", "10",
-                          "--type", "RSDS")
-        if not data:
-            pytest.skip("No RSDS found")
-        for r in data:
-            uri = r.get("uri", "")
-            parts = [p for p in uri.split("/") if p]
-            if "rsds" not in parts:
-                continue
-            idx = parts.index("rsds")
-            if idx + 3 >= len(parts):
-                continue
-            name = parts[idx + 1]
-            logsys = parts[idx + 2]
-            probe = cli.run("bw", "read-rsds", name, "--source-system", logsys)
-            if probe.returncode == 0:
-                return (name, logsys)
-        pytest.skip("No readable RSDS found")
+    # --- shared read-* error tests ---
 
-    @pytest.fixture(scope="class")
-    def known_query(self, cli, bw_has_search):
-        """Find a readable BW query component."""
-        result = cli.run("bw", "search", "*", "--max", "10", "--type", "QUERY")
-        if result.returncode != 0:
-            pytest.skip("QUERY search not supported on this system")
-        data = json.loads(result.stdout)
-        if not data:
-            pytest.skip("No QUERY found")
-        for r in data:
-            result = cli.run("bw", "read-query", "query", r["name"])
-            if result.returncode == 0:
-                return r["name"]
-        pytest.skip("No readable QUERY found")
+    @pytest.mark.parametrize("command", ["read-adso", "read-trfn", "read-dtp"])
+    def test_read_nonexistent(self, cli, bw_has_search, command):
+        """read-* for a nonexistent object returns not-found."""
+        result = cli.run("bw", command, "ZZZZZ_NONEXISTENT_99999")
+        assert result.returncode == 2
 
-    @pytest.fixture(scope="class")
-    def known_dmod(self, cli, bw_has_search):
-        """Find a readable BW dataflow (DMOD)."""
-        data = cli.run_ok("bw", "search", "*", "--max", "10", "--type", "DMOD")
-        if not data:
-            pytest.skip("No DMOD found")
-        for r in data:
-            result = cli.run("bw", "read-dmod", r["name"])
-            if result.returncode == 0:
-                return r["name"]
-        pytest.skip("No readable DMOD found")
+    @pytest.mark.no_backend
+    @pytest.mark.parametrize(
+        "command", ["read-adso", "read-trfn", "read-dtp", "read-rsds"])
+    def test_read_missing_args(self, cli, command):
+        """read-* without a name fails."""
+        result = cli.run("bw", command)
+        assert result.returncode != 0
 
     # --- read-adso tests ---
 
     def test_read_adso_returns_fields(self, cli, known_adso):
         """read-adso returns structured field list."""
-        data = cli.run_ok("bw", "read-adso", known_adso)
+        name = known_adso["name"]
+        data = cli.run_ok("bw", "read-adso", name)
         assert "name" in data
-        assert data["name"] == known_adso
+        assert data["name"] == name
         assert "fields" in data
         assert isinstance(data["fields"], list)
 
     def test_read_adso_field_has_properties(self, cli, known_adso):
         """Each ADSO field has name, data_type, key."""
-        data = cli.run_ok("bw", "read-adso", known_adso)
+        data = cli.run_ok("bw", "read-adso", known_adso["name"])
         if not data["fields"]:
             pytest.skip("ADSO has no fields")
-        f = data["fields"][0]
-        assert "name" in f
-        assert "data_type" in f
-        assert "key" in f
+        _assert_keys(data["fields"][0], _ADSO_FIELD_KEYS)
 
     def test_read_adso_has_package(self, cli, known_adso):
         """read-adso returns package name."""
-        data = cli.run_ok("bw", "read-adso", known_adso)
+        data = cli.run_ok("bw", "read-adso", known_adso["name"])
         assert "package" in data
 
     def test_read_adso_human_readable(self, cli, known_adso):
         """read-adso without --json produces human-readable output."""
-        result = cli.run_no_json("bw", "read-adso", known_adso)
+        name = known_adso["name"]
+        result = cli.run_no_json("bw", "read-adso", name)
         assert result.returncode == 0
-        assert known_adso in result.stdout
-
-    def test_read_adso_nonexistent(self, cli, bw_has_search):
-        """read-adso for nonexistent ADSO returns error."""
-        result = cli.run("bw", "read-adso", "ZZZZZ_NONEXISTENT_99999")
-        assert result.returncode == 2
-
-    def test_read_adso_missing_args(self, cli):
-        """bw read-adso without name fails."""
-        result = cli.run("bw", "read-adso")
-        assert result.returncode != 0
+        assert name in result.stdout
 
     # --- read-trfn tests ---
 
     def test_read_trfn_returns_source_target(self, cli, known_trfn):
         """read-trfn returns source and target information."""
         data = cli.run_ok("bw", "read-trfn", known_trfn)
-        assert "name" in data
+        _assert_keys(data, _CONNECTION_KEYS)
         assert data["name"] == known_trfn
-        assert "source_name" in data
-        assert "source_type" in data
-        assert "target_name" in data
-        assert "target_type" in data
 
     def test_read_trfn_has_fields_and_rules(self, cli, known_trfn):
         """read-trfn returns field lists and rules."""
         data = cli.run_ok("bw", "read-trfn", known_trfn)
-        assert "source_fields" in data
-        assert "target_fields" in data
-        assert "rules" in data
+        _assert_keys(data, _TRFN_FIELD_KEYS)
         assert isinstance(data["source_fields"], list)
         assert isinstance(data["target_fields"], list)
         assert isinstance(data["rules"], list)
@@ -169,25 +223,14 @@ class TestBwLineage:
         data = cli.run_ok("bw", "read-trfn", known_trfn)
         if not data["rules"]:
             pytest.skip("Transformation has no rules")
-        r = data["rules"][0]
-        assert "source_field" in r
-        assert "target_field" in r
-        assert "rule_type" in r
+        _assert_keys(data["rules"][0], _TRFN_RULE_KEYS)
 
     def test_read_trfn_includes_step_contract_fields(self, cli, known_trfn):
         """read-trfn exposes expanded step/group contract fields."""
         data = cli.run_ok("bw", "read-trfn", known_trfn)
-        assert "start_routine" in data
-        assert "end_routine" in data
-        assert "expert_routine" in data
-        assert "hana_runtime" in data
+        _assert_keys(data, _TRFN_STEP_KEYS)
         if data["rules"]:
-            r = data["rules"][0]
-            assert "source_fields" in r
-            assert "target_fields" in r
-            assert "group_id" in r
-            assert "group_type" in r
-            assert "step_attributes" in r
+            _assert_keys(data["rules"][0], _TRFN_GROUP_KEYS)
 
     def test_read_trfn_human_readable(self, cli, known_trfn):
         """read-trfn without --json produces human-readable output."""
@@ -195,27 +238,13 @@ class TestBwLineage:
         assert result.returncode == 0
         assert known_trfn in result.stdout
 
-    def test_read_trfn_nonexistent(self, cli, bw_has_search):
-        """read-trfn for nonexistent TRFN returns error."""
-        result = cli.run("bw", "read-trfn", "ZZZZZ_NONEXISTENT_99999")
-        assert result.returncode == 2
-
-    def test_read_trfn_missing_args(self, cli):
-        """bw read-trfn without name fails."""
-        result = cli.run("bw", "read-trfn")
-        assert result.returncode != 0
-
     # --- read-dtp tests ---
 
     def test_read_dtp_returns_connection(self, cli, known_dtp):
         """read-dtp returns source/target connection."""
         data = cli.run_ok("bw", "read-dtp", known_dtp)
-        assert "name" in data
+        _assert_keys(data, _CONNECTION_KEYS)
         assert data["name"] == known_dtp
-        assert "source_name" in data
-        assert "source_type" in data
-        assert "target_name" in data
-        assert "target_type" in data
 
     def test_read_dtp_has_source_system(self, cli, known_dtp):
         """read-dtp includes source_system field."""
@@ -225,16 +254,7 @@ class TestBwLineage:
     def test_read_dtp_includes_execution_contract_fields(self, cli, known_dtp):
         """read-dtp exposes execution/filter/program flow contract fields."""
         data = cli.run_ok("bw", "read-dtp", known_dtp)
-        assert "type" in data
-        assert "request_selection_mode" in data
-        assert "extraction_settings" in data
-        assert "execution_settings" in data
-        assert "runtime_properties" in data
-        assert "error_handling" in data
-        assert "dtp_execution" in data
-        assert "semantic_group_fields" in data
-        assert "filter_fields" in data
-        assert "program_flow" in data
+        _assert_keys(data, _DTP_CONTRACT_KEYS)
 
     def test_read_dtp_human_readable(self, cli, known_dtp):
         """read-dtp without --json produces human-readable output."""
@@ -242,16 +262,6 @@ class TestBwLineage:
         assert result.returncode == 0
         assert known_dtp in result.stdout
 
-    def test_read_dtp_nonexistent(self, cli, bw_has_search):
-        """read-dtp for nonexistent DTP returns error."""
-        result = cli.run("bw", "read-dtp", "ZZZZZ_NONEXISTENT_99999")
-        assert result.returncode == 2
-
-    def test_read_dtp_missing_args(self, cli):
-        """bw read-dtp without name fails."""
-        result = cli.run("bw", "read-dtp")
-        assert result.returncode != 0
-
     # --- read-rsds tests ---
 
     def test_read_rsds_returns_fields(self, cli, known_rsds):
@@ -268,228 +278,179 @@ class TestBwLineage:
                          "--source-system", "ECLCLNT100")
         assert result.returncode == 2
 
-    def test_read_rsds_missing_args(self, cli):
-        """bw read-rsds without name/source-system fails."""
-        result = cli.run("bw", "read-rsds")
-        assert result.returncode != 0
-
     # --- read-query tests ---
 
     def test_read_query_returns_component_contract(self, cli, known_query):
         """read-query returns query component contract."""
         data = cli.run_ok("bw", "read-query", "query", known_query)
+        _validate_query_component(data)
         assert data["name"] == known_query
-        assert data["component_type"] == "QUERY"
-        assert data["schema_version"] == "1.0"
-        assert isinstance(data.get("root_node_id"), str)
-        assert data["root_node_id"]
-        assert "metadata" in data
-        assert isinstance(data["metadata"], dict)
         assert data["metadata"].get("name") == known_query
-        assert isinstance(data.get("nodes"), list)
-        assert isinstance(data.get("edges"), list)
-        assert any(n.get("id") == data["root_node_id"] for n in data["nodes"])
-        assert all(isinstance(n.get("id"), str) for n in data["nodes"])
-        assert all(isinstance(e.get("from"), str) and isinstance(e.get("to"), str)
-                   for e in data["edges"])
-        assert "references" in data
-        assert isinstance(data["references"], list)
-
-    def test_read_query_default_mermaid_output(self, cli):
+        assert any(n["id"] == data["root_node_id"] for n in data["nodes"])
+
+    def test_read_query_default_mermaid_output(self, cli, demo_query):
         """read-query without --json defaults to Mermaid graph."""
-        query_name = "0D_FC_NW_C01_Q0007"
-        result = cli.run_no_json("bw", "read-query", query_name)
-        if result.returncode != 0:
-            pytest.skip("Known demo query not available in this landscape")
+        result = cli.run_no_json("bw", "read-query", _DEMO_QUERY)
+        assert result.returncode == 0, result.stderr
         out = result.stdout
         assert out.startswith("graph TD")
         assert "subgraph Query" in out
         assert "subgraph References" in out
         assert "classDef query" in out
-        assert query_name in out
+        assert _DEMO_QUERY in out
         assert "VARIABLE: 0D_NW_ACTCMON" in out
 
-    def test_read_query_detailed_mermaid_layout(self, cli):
+    def test_read_query_detailed_mermaid_layout(self, cli, demo_query):
         """read-query supports detailed Mermaid layout and LR direction."""
-        query_name = "0D_FC_NW_C01_Q0007"
         result = cli.run_no_json(
-            "bw", "read-query", query_name, "--layout=detailed", "--direction=LR"
+            "bw", "read-query", _DEMO_QUERY, "--layout=detailed", "--direction=LR"
         )
-        if result.returncode != 0:
-            pytest.skip("Known demo query not available in this landscape")
+        assert result.returncode == 0, result.stderr
         out = result.stdout
         assert out.startswith("graph LR")
         assert "subgraph Query" in out
         assert "subgraph References" in out
         assert "classDef query" in out
 
+    @pytest.mark.no_backend
     def test_read_query_invalid_layout_fails(self, cli):
         """read-query with unsupported layout fails with validation error."""
-        result = cli.run_no_json("bw", "read-query", "0D_FC_NW_C01_Q0007", "--layout=wide")
+        result = cli.run_no_json("bw", "read-query", _DEMO_QUERY, "--layout=wide")
         assert result.returncode == 99
-        assert "invalid --layout" in result.stderr.lower()
+        assert _invalid_option(result) == "layout"
 
+    @pytest.mark.no_backend
     def test_read_query_invalid_direction_fails(self, cli):
         """read-query with unsupported direction fails with validation error."""
-        result = cli.run_no_json("bw", "read-query", "0D_FC_NW_C01_Q0007", "--direction=BT")
+        result = cli.run_no_json("bw", "read-query", _DEMO_QUERY, "--direction=BT")
         assert result.returncode == 99
-        assert "invalid --direction" in result.stderr.lower()
+        assert _invalid_option(result) == "direction"
 
-    def test_read_query_json_reduction_metadata(self, cli):
+    def test_read_query_json_reduction_metadata(self, cli, demo_query):
         """read-query JSON includes explicit reduction metadata when requested."""
-        query_name = "0D_FC_NW_C01_Q0007"
-        result = cli.run(
-            "bw", "read-query", "query", query_name,
+        data = cli.run_ok(
+            "bw", "read-query", "query", _DEMO_QUERY,
             "--max-nodes-per-role=1", "--focus-role=filter"
         )
-        if result.returncode != 0:
-            pytest.skip("Known demo query not available in this landscape")
-        data = json.loads(result.stdout.strip())
         reduction = data.get("reduction", {})
         assert reduction.get("applied") is True
         assert reduction.get("focus_role") == "filter"
         assert reduction.get("max_nodes_per_role") == 1
         assert isinstance(reduction.get("summaries"), list)
 
-    def test_read_query_catalog_json_shape(self, cli):
-        """read-query supports catalog-oriented flat JSON contract."""
-        query_name = "0D_FC_NW_C01_Q0007"
-        result = cli.run("bw", "read-query", "query", query_name, "--json-shape=catalog")
+    def test_read_query_catalog_json_shape(self, cli, demo_query):
+        """read-query supports catalog-oriented flat JSON contract."""
+        data = cli.run_ok("bw", "read-query", "query", _DEMO_QUERY,
+                          "--json-shape=catalog")
+        _validate_query_catalog(data)
+
+    def test_read_query_truth_json_shape_auto_resolution(self, cli, demo_query):
+        """read-query truth shape exposes resolution + candidate roots for lineage tooling."""
+        result = cli.run(
+            "bw", "read-query", "query", _DEMO_QUERY,
+            "--upstream=auto",
+            "--lineage-max-steps=4",
+            "--json-shape=truth"
+        )
         if result.returncode != 0:
-            pytest.skip("Known demo query not available in this landscape")
-        data = json.loads(result.stdout.strip())
-        assert data.get("contract") == "bw.query.catalog"
-        assert data.get("schema_version") == "2.0"
+            pytest.skip("Auto lineage resolution not available")
+        data = orjson.loads(result.stdout_bytes)
+        assert data.get("contract") == "bw.query.lineage.truth"
+        assert data.get("schema_version") == "3.0"
+        assert isinstance(data.get("candidate_roots"), list)
+        resolution = data.get("resolution", {})
+        assert resolution.get("mode") == "auto"
+        assert isinstance(resolution.get("complete"), bool)
+        assert isinstance(resolution.get("steps"), int)
         assert isinstance(data.get("nodes"), list)
         assert isinstance(data.get("edges"), list)
-        if data["nodes"]:
-            n = data["nodes"][0]
-            assert "node_id" in n
-            assert "business_key" in n
-            assert "object_type" in n
-            assert "object_name" in n
-            assert "source_component_type" in n
-            assert "source_component_name" in n
-        metrics = data.get("metrics", {})
-        assert isinstance(metrics.get("node_count"), int)
-        assert isinstance(metrics.get("edge_count"), int)
-        assert isinstance(metrics.get("ergonomics_flags"), list)
-
-    def test_read_query_truth_json_shape_auto_resolution(self, cli):
-        """read-query truth shape exposes resolution + candidate roots for lineage tooling."""
-        query_name = "0D_FC_NW_C01_Q0007"
-        result = cli.run(
-            "bw", "read-query", "query", query_name,
-            "--upstream=auto",
-            "--lineage-max-steps=4",
-            "--json-shape=truth"
-        )
-        if result.returncode != 0:
-            pytest.skip("Known demo query or auto lineage resolution not available")
-        data = json.loads(result.stdout.strip())
-        assert data.get("contract") == "bw.query.lineage.truth"
-        assert data.get("schema_version") == "3.0"
-        assert isinstance(data.get("candidate_roots"), list)
-        resolution = data.get("resolution", {})
-        assert resolution.get("mode") == "auto"
-        assert isinstance(resolution.get("complete"), bool)
-        assert isinstance(resolution.get("steps"), int)
-        assert isinstance(data.get("nodes"), list)
-        assert isinstance(data.get("edges"), list)
-
-
-    def test_read_query_with_upstream_lineage_composition(self, cli, known_dtp):
+
+
+    def test_read_query_with_upstream_lineage_composition(self, cli, demo_query,
+                                                          known_dtp):
         """read-query can compose upstream DTP lineage into one graph payload."""
-        query_name = "0D_FC_NW_C01_Q0007"
         result = cli.run(
-            "bw", "read-query", "query", query_name,
+            "bw", "read-query", "query", _DEMO_QUERY,
             "--upstream-dtp", known_dtp,
             "--upstream-no-xref",
             "--json-shape=catalog"
         )
         if result.returncode != 0:
-            pytest.skip("Query or DTP lineage not available in this landscape")
-        data = json.loads(result.stdout.strip())
+            pytest.skip("DTP lineage not available in this landscape")
+        data = orjson.loads(result.stdout_bytes)
         assert isinstance(data.get("nodes"), list)
         assert isinstance(data.get("edges"), list)
         assert any(n.get("object_type") == "DTPA" and n.get("object_name") == known_dtp
                    for n in data["nodes"])
         assert any(e.get("edge_type") == "upstream_bridge" for e in data["edges"])
 
+    @pytest.mark.no_backend
     def test_read_query_invalid_focus_role_fails(self, cli):
         """read-query with unsupported focus role fails with validation error."""
         result = cli.run_no_json(
-            "bw", "read-query", "0D_FC_NW_C01_Q0007", "--focus-role=everything"
+            "bw", "read-query", _DEMO_QUERY, "--focus-role=everything"
         )
         assert result.returncode == 99
-        assert "invalid --focus-role" in result.stderr.lower()
+        assert _invalid_option(result) == "focus-role"
 
+    @pytest.mark.no_backend
     def test_read_query_invalid_max_nodes_per_role_fails(self, cli):
         """read-query with non-positive max nodes per role fails with validation error."""
         result = cli.run_no_json(
-            "bw", "read-query", "0D_FC_NW_C01_Q0007", "--max-nodes-per-role=0"
+            "bw", "read-query", _DEMO_QUERY, "--max-nodes-per-role=0"
         )
         assert result.returncode == 99
-        assert "invalid --max-nodes-per-role" in result.stderr.lower()
+        assert _invalid_option(result) == "max-nodes-per-role"
 
-    def test_read_query_invalid_json_shape_fails(self, cli):
-        """read-query with unsupported json shape fails with validation error."""
+    @pytest.mark.no_backend
+    def test_read_query_invalid_json_shape_fails(self, cli):
+        """read-query with unsupported json shape fails with validation error."""
         result = cli.run_no_json(
-            "bw", "read-query", "0D_FC_NW_C01_Q0007", "--json-shape=flat"
+            "bw", "read-query", _DEMO_QUERY, "--json-shape=flat"
         )
-        assert result.returncode == 99
-        assert "invalid --json-shape" in result.stderr.lower()
-
-    def test_read_query_invalid_lineage_max_steps_fails(self, cli):
-        """read-query with non-positive lineage max steps fails with validation error."""
-        result = cli.run_no_json(
-            "bw", "read-query", "0D_FC_NW_C01_Q0007", "--lineage-max-steps=0"
-        )
-        assert result.returncode == 99
-        assert "invalid --lineage-max-steps" in result.stderr.lower()
-
+        assert result.returncode == 99
+        assert _invalid_option(result) == "json-shape"
+
+    @pytest.mark.no_backend
+    def test_read_query_invalid_lineage_max_steps_fails(self, cli):
+        """read-query with non-positive lineage max steps fails with validation error."""
+        result = cli.run_no_json(
+            "bw", "read-query", _DEMO_QUERY, "--lineage-max-steps=0"
+        )
+        assert result.returncode == 99
+        assert _invalid_option(result) == "lineage-max-steps"
+
+    @pytest.mark.no_backend
     def test_read_query_upstream_dtp_for_non_query_fails(self, cli):
         """upstream composition is only supported for query component reads."""
         result = cli.run_no_json(
             "bw", "read-query", "variable", "0D_NW_ACTCMON", "--upstream-dtp=DTP_ZSALES"
         )
         assert result.returncode == 99
-        assert "only supported for query components" in result.stderr.lower()
+        assert _QUERY_ONLY_RE.search(result.stderr_bytes)
 
-    def test_read_query_mermaid_renderable_with_mmdc(self, cli):
+    @requires_mmdc
+    def test_read_query_mermaid_renderable_with_mmdc(self, cli, demo_query,
+                                                      mmdc_cmd, tmp_path):
         """Mermaid output can be rendered to SVG with mmdc when installed."""
-        if shutil.which("mmdc") is None:
-            pytest.skip("mmdc not installed")
-
-        query_name = "0D_FC_NW_C01_Q0007"
-        result = cli.run_no_json("bw", "read-query", query_name, "--layout=detailed")
-        if result.returncode != 0:
-            pytest.skip("Known demo query not available in this landscape")
+        result = cli.run_no_json("bw", "read-query", _DEMO_QUERY, "--layout=detailed")
+        assert result.returncode == 0, result.stderr
+
+        mmd_path = tmp_path / "query.mmd"
+        svg_path = tmp_path / "query.svg"
+        mmd_path.write_bytes(result.stdout_bytes)
+        render = subprocess.run(
+            [mmdc_cmd, "-i", str(mmd_path), "-o", str(svg_path)],
+            capture_output=True,
+            timeout=30,
+        )
+        assert render.returncode == 0, render.stderr.decode(errors="replace")
+        assert b"<svg" in svg_path.read_bytes()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            mmd_path = f"{tmpdir}/query.mmd"
-            svg_path = f"{tmpdir}/query.svg"
-            with open(mmd_path, "w", encoding="utf-8") as f:
-                f.write(result.stdout)
-            render = subprocess.run(
-                ["mmdc", "-i", mmd_path, "-o", svg_path],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
-            assert render.returncode == 0, render.stderr
-            with open(svg_path, "r", encoding="utf-8") as f:
-                svg = f.read()
-            assert "<svg" in svg
-
-    def test_read_query_known_demo_query_parses_live_shape(self, cli):
+    def test_read_query_known_demo_query_parses_live_shape(self, demo_query):
         """Known SAP demo query returns parsed description/provider/references."""
-        query_name = "0D_FC_NW_C01_Q0007"
-        result = cli.run("bw", "read-query", "query", query_name)
-        if result.returncode != 0:
-            pytest.skip("Known demo query not available in this landscape")
-        data = json.loads(result.stdout.strip())
-        assert data["name"] == query_name
+        data = demo_query
+        assert data["name"] == _DEMO_QUERY
         assert data["component_type"] == "QUERY"
         assert data.get("description")
         assert data.get("info_provider")
@@ -508,30 +469,29 @@ class TestBwLineage:
         """read-query for nonexistent object returns a clear not-found error."""
         result = cli.run("bw", "read-query", "query", "ZZZZZ_NONEXISTENT_Q_99999")
         assert result.returncode == 2
-        assert "not found" in result.stderr.lower()
+        assert _NOT_FOUND_RE.search(result.stderr_bytes)
 
+    @pytest.mark.no_backend
     def test_read_query_invalid_component_type(self, cli):
         """bw read-query with unsupported component type fails."""
         result = cli.run("bw", "read-query", "unknown", "ZQ_TEST")
         assert result.returncode != 0
-        assert "unsupported query component type" in result.stderr.lower()
+        assert _UNSUPPORTED_COMPONENT_RE.search(result.stderr_bytes)
 
+    @pytest.mark.no_backend
     def test_read_query_invalid_format(self, cli):
         """bw read-query with unsupported --format fails."""
-        result = cli.run("bw", "read-query", "0D_FC_NW_C01_Q0007", "--format=dot")
+        result = cli.run("bw", "read-query", _DEMO_QUERY, "--format=dot")
         assert result.returncode != 0
-        assert "invalid --format" in result.stderr.lower()
+        assert _invalid_option(result) == "format"
 
     # --- read-dmod tests ---
 
     def test_read_dmod_returns_topology_contract(self, cli, known_dmod):
         """read-dmod returns dataflow topology contract."""
         data = cli.run_ok("bw", "read-dmod", known_dmod)
+        _validate_dmod_topology(data)
         assert data["name"] == known_dmod
-        assert "nodes" in data
-        assert "connections" in data
-        assert isinstance(data["nodes"], list)
-        assert isinstance(data["connections"], list)
 
     # --- lineage tests ---
 
@@ -539,27 +499,18 @@ class TestBwLineage:
         """bw lineage returns canonical graph contract."""
         result = cli.run("bw", "lineage", known_dtp)
         if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
+            if not_activated(result):
                 pytest.skip("bw lineage prerequisites not available")
             pytest.fail(f"bw lineage failed: {result.stderr.strip()}")
-        data = json.loads(result.stdout.strip())
-        assert data.get("schema_version") == "1.0"
-        assert data.get("root", {}).get("type") == "DTPA"
-        assert data.get("root", {}).get("name") == known_dtp
-        assert isinstance(data.get("nodes"), list)
-        assert isinstance(data.get("edges"), list)
-        assert isinstance(data.get("provenance"), list)
-        assert isinstance(data.get("warnings"), list)
+        data = orjson.loads(result.stdout_bytes)
+        _validate_lineage_graph(data)
+        assert data["root"]["name"] == known_dtp
 
     def test_lineage_graph_no_xref_contract(self, cli, known_dtp):
         """bw lineage --no-xref still returns graph contract."""
         result = cli.run("bw", "lineage", known_dtp, "--no-xref")
         if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
+            if not_activated(result):
                 pytest.skip("bw lineage prerequisites not available")
             pytest.fail(f"bw lineage --no-xref failed: {result.stderr.strip()}")
-        data = json.loads(result.stdout.strip())
-        assert isinstance(data.get("nodes"), list)
-        assert isinstance(data.get("edges"), list)
+        _validate_lineage_graph(orjson.loads(result.stdout_bytes))
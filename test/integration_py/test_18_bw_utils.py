@@ -1,9 +1,9 @@
 """BW repository utility and advanced service command tests."""
 
-import json
-
 import pytest
 
+from cli_runner import endpoint_unavailable, not_activated, parse_stdout
+
 
 # ===========================================================================
 # BW Repository Utility Services
@@ -17,11 +17,10 @@ class TestBwRepositoryUtils:
             pytest.skip("bwSearchMD service not available")
         result = cli.run("bw", "search-md")
         if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
+            if not_activated(result):
                 pytest.skip("bwSearchMD listed but not activated")
         assert result.returncode == 0
-        data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        data = parse_stdout(result, [])
         assert isinstance(data, list)
 
     def test_favorites_list_json(self, cli, bw_terms):
@@ -29,13 +28,13 @@ class TestBwRepositoryUtils:
             pytest.skip("backendFavorites service not available")
         result = cli.run("bw", "favorites")
         if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if "not activated" in stderr or "not implemented" in stderr:
+            if not_activated(result):
                 pytest.skip("backendFavorites listed but not activated")
         assert result.returncode == 0
-        data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+        data = parse_stdout(result, [])
         assert isinstance(data, list)
 
+    @pytest.mark.no_backend
     def test_nodepath_requires_object_uri(self, cli):
         result = cli.run("bw", "nodepath")
         assert result.returncode != 0
@@ -45,12 +44,11 @@ class TestBwRepositoryUtils:
             pytest.skip("validation service not available")
         result = cli.run("bw", "validate", "ADSO", "ZZZZZ_NONEXISTENT_99999")
         if result.returncode == 0:
-            data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+            data = parse_stdout(result, [])
             assert isinstance(data, list)
         else:
-            stderr = result.stderr.strip().lower()
-            if ("not activated" in stderr or "not implemented" in stderr or
-                    "\"http_status\":405" in stderr):
+            if (not_activated(result) or
+                    b'"http_status":405' in result.stderr_bytes):
                 pytest.skip("validation listed but not activated")
             assert result.returncode != 0
 
@@ -59,12 +57,11 @@ class TestBwRepositoryUtils:
             pytest.skip("move_requests service not available")
         result = cli.run("bw", "move")
         if result.returncode == 0:
-            data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+            data = parse_stdout(result, [])
             assert isinstance(data, list)
             return
-        stderr = result.stderr.strip().lower()
-        if ("not activated" in stderr or "not implemented" in stderr or
-                "\"http_status\":405" in stderr):
+        if (not_activated(result) or
+                b'"http_status":405' in result.stderr_bytes):
             pytest.skip("move_requests listed but not activated")
         assert result.returncode != 0
 
@@ -73,12 +70,11 @@ class TestBwRepositoryUtils:
             pytest.skip("applicationlog service not available")
         result = cli.run("bw", "applog", "--username", "DEVELOPER")
         if result.returncode == 0:
-            data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
+            data = parse_stdout(result, [])
             assert isinstance(data, list)
             return
-        stderr = result.stderr.strip().lower()
-        if ("not activated" in stderr or "not implemented" in stderr or
-                "\"http_status\":500" in stderr):
+        if (not_activated(result) or
+                b'"http_status":500' in result.stderr_bytes):
             pytest.skip("applicationlog listed but not activated")
         assert result.returncode != 0
 
@@ -87,12 +83,11 @@ class TestBwRepositoryUtils:
             pytest.skip("message service not available")
         result = cli.run("bw", "message", "RSDHA", "001", "--msgv1", "ZOBJ")
         if result.returncode == 0:
-            data = json.loads(result.stdout.strip()) if result.stdout.strip() else {}
+            data = parse_stdout(result, {})
             assert isinstance(data, dict)
             assert "text" in data
             return
-        stderr = result.stderr.strip().lower()
-        if "not activated" in stderr or "not implemented" in stderr:
+        if not_activated(result):
             pytest.skip("message listed but not activated")
         assert result.returncode != 99
 
@@ -101,62 +96,42 @@ class TestBwRepositoryUtils:
 # BW Advanced Services
 # ===========================================================================
 
+def _optional_list(result, label):
+    """JSON list from an optional endpoint; skip if ``label`` is unavailable.
+
+    Other failures must be backend errors rather than usage errors (99) and
+    yield None.
+    """
+    if result.returncode != 0:
+        if endpoint_unavailable(result):
+            pytest.skip(f"{label} endpoint not available")
+        assert result.returncode != 99
+        return None
+    data = parse_stdout(result, [])
+    assert isinstance(data, list)
+    return data
+
+
 @pytest.mark.bw
 class TestBwAdvancedServices:
 
     def test_valuehelp_infoareas(self, cli, bw_available):
-        result = cli.run("bw", "valuehelp", "infoareas", "--max", "10")
-        if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if any(s in stderr for s in ("not activated", "not implemented",
-                                         "not found", "\"http_status\":404", "\"http_status\":405")):
-                pytest.skip("BW valuehelp endpoint not available")
-            assert result.returncode != 0
-        data = json.loads(result.stdout.strip()) if result.stdout.strip() else []
-        assert isinstance(data, list)
+        _optional_list(cli.run("bw", "valuehelp", "infoareas", "--max", "10"),
+                       "BW valuehelp")
 
     def test_reporting_and_qprops_capability(self, cli, bw_terms):
         if "queryProperties" not in bw_terms:
             pytest.skip("queryProperties not available")
-        qprops = cli.run("bw", "qprops")
-        if qprops.returncode != 0:
-            stderr = qprops.stderr.strip().lower()
-            if any(s in stderr for s in ("not activated", "not implemented",
-                                         "not found", "\"http_status\":404", "\"http_status\":405")):
-                pytest.skip("qprops endpoint not available")
-            assert qprops.returncode != 0
-        qprops_data = json.loads(qprops.stdout.strip()) if qprops.stdout.strip() else []
-        assert isinstance(qprops_data, list)
+        _optional_list(cli.run("bw", "qprops"), "qprops")
 
         report = cli.run("bw", "reporting", "DUMMY_QUERY", "--metadata-only")
         if report.returncode != 0:
-            stderr = report.stderr.strip().lower()
-            if any(s in stderr for s in ("not activated", "not implemented",
-                                         "not found", "\"http_status\":404", "\"http_status\":405",
-                                         "\"http_status\":500")):
+            if (endpoint_unavailable(report)
+                    or b'"http_status":500' in report.stderr_bytes):
                 pytest.skip("reporting endpoint not available")
             # Invalid compid / backend errors are acceptable capability proof
             assert report.returncode != 99
 
     def test_virtualfolders_and_datavolumes_capability(self, cli):
-        vf = cli.run("bw", "virtualfolders")
-        if vf.returncode != 0:
-            stderr = vf.stderr.strip().lower()
-            if any(s in stderr for s in ("not activated", "not implemented",
-                                         "not found", "\"http_status\":404", "\"http_status\":405")):
-                pytest.skip("virtualfolders endpoint not available")
-            assert vf.returncode != 99
-        else:
-            data = json.loads(vf.stdout.strip()) if vf.stdout.strip() else []
-            assert isinstance(data, list)
-
-        dv = cli.run("bw", "datavolumes")
-        if dv.returncode != 0:
-            stderr = dv.stderr.strip().lower()
-            if any(s in stderr for s in ("not activated", "not implemented",
-                                         "not found", "\"http_status\":404", "\"http_status\":405")):
-                pytest.skip("datavolumes endpoint not available")
-            assert dv.returncode != 99
-        else:
-            data = json.loads(dv.stdout.strip()) if dv.stdout.strip() else []
-            assert isinstance(data, list)
+        _optional_list(cli.run("bw", "virtualfolders"), "virtualfolders")
+        _optional_list(cli.run("bw", "datavolumes"), "datavolumes")
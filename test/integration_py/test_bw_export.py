@@ -1,36 +1,46 @@
 """BW export command integration tests — bw export-area <infoarea>."""
 
-import json
 import os
-import tempfile
 
+import orjson
 import pytest
 
 
+def _object_types(objects, allowed=None):
+    """Check every exported object in one pass; return the set of types.
+
+    Each object must carry ``name`` and ``type``, and with ``allowed`` its
+    type must be one of those.
+    """
+    types = set()
+    for obj in objects:
+        assert "name" in obj, f"Object missing 'name': {obj}"
+        assert "type" in obj, f"Object missing 'type': {obj}"
+        if allowed is not None:
+            assert obj["type"] in allowed, (
+                f"Expected only {sorted(allowed)} objects but got type {obj['type']!r}"
+            )
+        types.add(obj["type"])
+    return types
+
+
 @pytest.mark.bw
 class TestBwExport:
     """Integration tests for 'erpl-adt bw export-area <infoarea>'."""
 
     @pytest.fixture(scope="class")
-    def known_infoarea(self, cli, bw_has_search):
-        """Find a known InfoArea to export."""
-        data = cli.run_ok("bw", "search", "*", "--type", "AREA", "--max", "5")
-        if not data:
-            pytest.skip("No AREA objects found on this system")
-        # Prefer the demo infoarea if present
-        for item in data:
-            if "0D_NW_DEMO" in item.get("name", ""):
-                return item["name"]
-        return data[0]["name"]
+    def area_export(self, cli, known_infoarea):
+        """Default catalog export, run once and shared by the read-only checks."""
+        return cli.run_ok("bw", "export-area", known_infoarea,
+                          "--no-lineage", "--no-queries")
 
     # -----------------------------------------------------------------------
     # Catalog JSON shape (default)
     # -----------------------------------------------------------------------
 
-    def test_export_catalog_json(self, cli, known_infoarea):
+    def test_export_catalog_json(self, area_export, known_infoarea):
         """Catalog export has required contract, objects, and dataflow sections."""
-        data = cli.run_ok("bw", "export-area", known_infoarea,
-                          "--no-lineage", "--no-queries")
+        data = area_export
         assert data.get("contract") == "bw.infoarea.export", (
             f"Expected contract='bw.infoarea.export', got {data.get('contract')!r}"
         )
@@ -40,13 +50,9 @@ class TestBwExport:
         assert "schema_version" in data
         assert "exported_at" in data
 
-    def test_export_objects_have_types(self, cli, known_infoarea):
+    def test_export_objects_have_types(self, area_export):
         """Each exported object has name and type fields."""
-        data = cli.run_ok("bw", "export-area", known_infoarea,
-                          "--no-lineage", "--no-queries")
-        for obj in data.get("objects", []):
-            assert "name" in obj, f"Object missing 'name': {obj}"
-            assert "type" in obj, f"Object missing 'type': {obj}"
+        _object_types(area_export.get("objects", []))
 
     # -----------------------------------------------------------------------
     # Mermaid output
@@ -88,10 +94,7 @@ class TestBwExport:
                           "--types", "ADSO",
                           "--no-lineage", "--no-queries")
         assert "objects" in data
-        for obj in data["objects"]:
-            assert obj["type"] == "ADSO", (
-                f"Expected only ADSO objects but got type {obj['type']!r}"
-            )
+        _object_types(data["objects"], allowed={"ADSO"})
 
     # -----------------------------------------------------------------------
     # --no-lineage flag
@@ -112,36 +115,35 @@ class TestBwExport:
     # --out-dir flag
     # -----------------------------------------------------------------------
 
-    def test_export_out_dir(self, cli, known_infoarea):
+    def test_export_out_dir(self, cli, known_infoarea, tmp_path):
         """--out-dir creates catalog JSON and Mermaid .mmd files on disk."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = cli.run_no_json(
-                "bw", "export-area", known_infoarea,
-                "--out-dir", tmpdir,
-                "--no-lineage", "--no-queries",
-            )
-            assert result.returncode == 0, f"export --out-dir failed: {result.stderr}"
-            catalog_path = os.path.join(tmpdir, known_infoarea + "_catalog.json")
-            mmd_path = os.path.join(tmpdir, known_infoarea + "_dataflow.mmd")
-            assert os.path.exists(catalog_path), f"Missing catalog file: {catalog_path}"
-            assert os.path.exists(mmd_path), f"Missing mermaid file: {mmd_path}"
-            # Verify catalog is valid JSON with expected contract
-            with open(catalog_path) as f:
-                data = json.load(f)
-            assert data.get("contract") == "bw.infoarea.export"
-            # Verify mermaid has graph LR
-            with open(mmd_path) as f:
-                mmd_content = f.read()
-            assert "graph LR" in mmd_content
+        tmpdir = str(tmp_path)
+        result = cli.run_no_json(
+            "bw", "export-area", known_infoarea,
+            "--out-dir", tmpdir,
+            "--no-lineage", "--no-queries",
+        )
+        assert result.returncode == 0, f"export --out-dir failed: {result.stderr}"
+        catalog_path = os.path.join(tmpdir, known_infoarea + "_catalog.json")
+        mmd_path = os.path.join(tmpdir, known_infoarea + "_dataflow.mmd")
+        assert os.path.exists(catalog_path), f"Missing catalog file: {catalog_path}"
+        assert os.path.exists(mmd_path), f"Missing mermaid file: {mmd_path}"
+        # Verify catalog is valid JSON with expected contract
+        with open(catalog_path, "rb") as f:
+            data = orjson.loads(f.read())
+        assert data.get("contract") == "bw.infoarea.export"
+        # Verify mermaid has graph LR (part of the header, so the head suffices)
+        with open(mmd_path, "rb") as f:
+            mmd_head = f.read(4096)
+        assert b"graph LR" in mmd_head
 
     # -----------------------------------------------------------------------
     # Error handling
     # -----------------------------------------------------------------------
 
-    def test_export_includes_iobj(self, cli, known_infoarea):
+    def test_export_includes_iobj(self, area_export, known_infoarea):
         """Export (with default search supplement) should include IOBJ objects."""
-        data = cli.run_ok("bw", "export-area", known_infoarea, "--no-lineage", "--no-queries")
-        types = {obj["type"] for obj in data.get("objects", [])}
+        types = _object_types(area_export.get("objects", []))
         if "IOBJ" not in types:
             pytest.xfail(
                 f"No IOBJ found in {known_infoarea} — infoarea may not have IOBJs "
@@ -158,9 +160,12 @@ class TestBwExport:
                 "BwSearchObjects in provenance despite --no-search flag"
             )
 
-    def test_export_missing_arg_exits_nonzero(self, cli):
-        """Missing infoarea argument must exit non-zero."""
-        result = cli.run_fail("bw", "export-area")
+    @pytest.mark.no_backend
+    @pytest.mark.parametrize(
+        "command", ["export-area", "export-query", "export-cube"])
+    def test_export_missing_arg_exits_nonzero(self, cli, command):
+        """export-* without a name must exit non-zero."""
+        result = cli.run_fail("bw", command)
         assert result.returncode != 0
 
 
@@ -169,9 +174,10 @@ class TestBwExportQuery:
     """Integration tests for 'erpl-adt bw export-query <name>'."""
 
     @pytest.fixture(scope="class")
-    def known_query(self, cli, bw_has_search):
+    def known_query(self, bw_search_cache):
         """Find a known ELEM (query) object to export."""
-        data = cli.run_ok("bw", "search", "*", "--type", "ELEM", "--max", "5")
+        data = bw_search_cache["ELEM"]
+        assert data is not None, "bw search --type ELEM failed"
         if not data:
             pytest.skip("No ELEM (query) objects found on this system")
         return data[0]["name"]
@@ -196,21 +202,17 @@ class TestBwExportQuery:
             f"Expected 'graph LR' in Mermaid output:\n{result.stdout}"
         )
 
-    def test_export_query_missing_arg_exits_nonzero(self, cli):
-        """Missing query name argument must exit non-zero."""
-        result = cli.run_fail("bw", "export-query")
-        assert result.returncode != 0
-
 
 @pytest.mark.bw
 class TestBwExportCube:
     """Integration tests for 'erpl-adt bw export-cube <name>'."""
 
     @pytest.fixture(scope="class")
-    def known_cube(self, cli, bw_has_search):
+    def known_cube(self, bw_search_cache):
         """Find a known ADSO/CUBE/HCPR object to export."""
         for obj_type in ("ADSO", "HCPR", "CUBE"):
-            data = cli.run_ok("bw", "search", "*", "--type", obj_type, "--max", "5")
+            data = bw_search_cache[obj_type]
+            assert data is not None, f"bw search --type {obj_type} failed"
             if data:
                 return data[0]["name"]
         pytest.skip("No ADSO/CUBE/HCPR objects found on this system")
@@ -234,8 +236,3 @@ class TestBwExportCube:
         assert "graph LR" in result.stdout, (
             f"Expected 'graph LR' in Mermaid output:\n{result.stdout}"
         )
-
-    def test_export_cube_missing_arg_exits_nonzero(self, cli):
-        """Missing cube name argument must exit non-zero."""
-        result = cli.run_fail("bw", "export-cube")
-        assert result.returncode != 0
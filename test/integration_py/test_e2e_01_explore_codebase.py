@@ -11,10 +11,23 @@ import pytest
 class TestExploreCodebase:
     """Read-only codebase exploration — the most common agent first-contact workflow."""
 
+    @pytest.fixture(scope="class")
+    def first_contact(self, cli):
+        """Results of steps 1-3, fetched together.
+
+        The three reads do not depend on each other, so they run
+        concurrently; the steps below only assert on them.
+        """
+        return cli.run_many([
+            ("discover", "services"),
+            ("package", "exists", "$TMP"),
+            ("package", "list", "$TMP"),
+        ], runner=cli.run_ok)
+
     @pytest.mark.order(1)
-    def test_step1_discover_services(self, cli):
+    def test_step1_discover_services(self, first_contact):
         """Step 1: Discover system capabilities."""
-        data = cli.run_ok("discover", "services")
+        data = first_contact[0]
         assert "workspaces" in data
         assert len(data["workspaces"]) > 0
         assert "has_packages" in data
@@ -22,15 +35,15 @@ class TestExploreCodebase:
         self.__class__.capabilities = data
 
     @pytest.mark.order(2)
-    def test_step2_package_exists(self, cli):
+    def test_step2_package_exists(self, first_contact):
         """Step 2: Check the $TMP development package exists."""
-        data = cli.run_ok("package", "exists", "$TMP")
+        data = first_contact[1]
         assert data.get("exists") is True
 
     @pytest.mark.order(3)
-    def test_step3_package_list(self, cli):
+    def test_step3_package_list(self, first_contact):
         """Step 3: List $TMP contents, verify objects are present."""
-        data = cli.run_ok("package", "list", "$TMP")
+        data = first_contact[2]
         assert isinstance(data, list)
         # $TMP should have at least some objects
         self.__class__.package_contents = data
@@ -5,7 +5,6 @@ Simulates an agent creating a brand-new utility class from scratch:
 """
 
 import json
-import os
 
 import pytest
 
@@ -66,11 +65,8 @@ class TestGreenfieldClass:
         ctx = e2e_context
         assert ctx["source_uri"] is not None, "Step 2 must run first"
         source = ABAP_SOURCE.format(name=ctx["name"])
-        src_file = os.path.join(str(ctx["tmp"]), "greenfield.abap")
-        with open(src_file, "w") as f:
-            f.write(source)
         ctx["cli"].run_ok("source", "write", ctx["source_uri"],
-                          "--file", src_file)
+                          "--file", "-", input=source.encode())
 
     @pytest.mark.order(4)
     def test_step4_read_inactive(self, e2e_context):
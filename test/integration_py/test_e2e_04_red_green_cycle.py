@@ -10,7 +10,6 @@ activated and non-activated systems.
 """
 
 import json
-import os
 
 import pytest
 
@@ -78,11 +77,8 @@ class TestRedGreenCycle:
         """Step 2: Write 'red' source — implementation returns 0, test expects 100."""
         ctx = e2e_context
         source = RED_SOURCE.format(name=ctx["name"])
-        src_file = os.path.join(str(ctx["tmp"]), "red.abap")
-        with open(src_file, "w") as f:
-            f.write(source)
         ctx["cli"].run_ok("source", "write", ctx["source_uri"],
-                          "--file", src_file)
+                          "--file", "-", input=source.encode())
 
     @pytest.mark.order(3)
     def test_step3_verify_red_source(self, e2e_context):
@@ -132,11 +128,8 @@ class TestRedGreenCycle:
         """Step 5: Write 'green' source — fix get_value() to return 100."""
         ctx = e2e_context
         source = GREEN_SOURCE.format(name=ctx["name"])
-        src_file = os.path.join(str(ctx["tmp"]), "green.abap")
-        with open(src_file, "w") as f:
-            f.write(source)
         ctx["cli"].run_ok("source", "write", ctx["source_uri"],
-                          "--file", src_file)
+                          "--file", "-", input=source.encode())
 
     @pytest.mark.order(6)
     def test_step6_verify_green_source(self, e2e_context):
@@ -156,10 +149,11 @@ class TestRedGreenCycle:
     def test_step7_quality_checks(self, e2e_context):
         """Step 7: Syntax check + ATC quality check on green code."""
         ctx = e2e_context
-        # Syntax check
-        syntax = ctx["cli"].run_ok("source", "check", ctx["source_uri"])
+        # Syntax check and ATC check are independent: run them together.
+        syntax, atc = ctx["cli"].run_many([
+            ("source", "check", ctx["source_uri"]),
+            ("check", "run", ctx["uri"]),
+        ], runner=ctx["cli"].run_ok)
         assert isinstance(syntax, list)
-        # ATC check
-        atc = ctx["cli"].run_ok("check", "run", ctx["uri"])
         assert "worklist_id" in atc
         assert "error_count" in atc
@@ -6,7 +6,6 @@ verify quality, prepare for shipment:
 """
 
 import json
-import os
 import re
 
 import pytest
@@ -14,6 +13,11 @@ import pytest
 
 TRANSPORT_PATTERN = re.compile(r"^[A-Z0-9]{3}[A-Z]\d{6}$")
 
+# Backends whose source write rejects the auto-lock round-trip.
+_AUTOLOCK_UNSUPPORTED_RE = re.compile(
+    rb'bad request|"http_status":400|lockobject|not implemented|not activated',
+    re.IGNORECASE)
+
 QUALITY_SOURCE = """\
 CLASS {name} DEFINITION PUBLIC FINAL CREATE PUBLIC
   FOR TESTING RISK LEVEL HARMLESS DURATION SHORT.
@@ -53,11 +57,10 @@ class TestQualityGate:
 
     @pytest.mark.order(2)
     def test_step2_verify_transport_list(self, e2e_context):
-        """Step 2: Verify transport list command works and transport format is valid."""
+        """Step 2: Verify transport list command works."""
         ctx = e2e_context
+        # Step 1 already validated the transport number's format.
         assert ctx.get("transport"), "Step 1 must run first"
-        # Verify the created transport has a valid format
-        assert TRANSPORT_PATTERN.match(ctx["transport"])
         # Verify transport list command succeeds (may be empty on trial systems)
         data = ctx["cli"].run_ok("transport", "list", "--user", "DEVELOPER")
         assert isinstance(data, list)
@@ -84,15 +87,10 @@ class TestQualityGate:
         ctx["source_uri"] = ctx["uri"] + "/source/main"
         # Write source (auto-lock)
         source = QUALITY_SOURCE.format(name=ctx["name"])
-        src_file = os.path.join(str(ctx["tmp"]), "quality.abap")
-        with open(src_file, "w") as f:
-            f.write(source)
         result = ctx["cli"].run("source", "write", ctx["source_uri"],
-                                "--file", src_file)
+                                "--file", "-", input=source.encode())
         if result.returncode != 0:
-            stderr = result.stderr.strip().lower()
-            if any(s in stderr for s in ("bad request", "\"http_status\":400",
-                                         "lockobject", "not implemented", "not activated")):
+            if _AUTOLOCK_UNSUPPORTED_RE.search(result.stderr_bytes):
                 pytest.skip("source write auto-lock unsupported on this backend profile")
             pytest.fail(f"source write failed: {result.stderr.strip()}")
 